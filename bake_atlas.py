@@ -0,0 +1,111 @@
+# bake_atlas.py – backt alle Spielbilder in Endgröße in einen Textur-Atlas
+# Aufruf:  python bake_atlas.py            → build/atlas.png + build/atlas.json
+#          python bake_atlas.py --check    → nur prüfen, ob der Atlas aktuell ist
+# build_web.py backt zusätzlich die Maßstäbe aus main.WEB_SCALES mit (im Browser gibt es keine Quellbilder).
+
+import os
+import sys
+import json
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import main as game
+
+PADDING = 2          # Abstand zwischen den Bildern (gegen Filter-Bluten)
+ATLAS_WIDTH = 512
+
+
+def collect_items(scales=(1.0,)):
+    """Alle Bilder so erzeugen, wie das Spiel sie zur Laufzeit braucht: (key, src, surface).
+    Pro Maßstab mit denselben Schlüsseln (Endgröße in Pixeln), unter denen die Builder nachschlagen."""
+    items = []
+    for s in scales:
+        def px(n):
+            return round(n * s)
+        for c in game.CHARACTERS:
+            items.append((game.atlas_key("scaled", c["skin"], size=[px(n) for n in game.SKIN_SIZE]), c["skin"],
+                          game.load_scaled_image(c["skin"], game.SKIN_SIZE, scale=s)))
+            items.append((game.atlas_key("face", c["avatar"], size=px(game.FACE_SIZE)), c["avatar"],
+                          game.make_face_circle_from_file(c["avatar"], size=game.FACE_SIZE, scale=s)))
+        for f in game.WING_FILES:
+            items.append((game.atlas_key("scaled", f, size=[px(n) for n in game.WING_SIZE]), f,
+                          game.load_scaled_image(f, game.WING_SIZE, scale=s)))
+        for spec in game.COLLECTIBLES:
+            size = px(spec.get("size", 64))
+            items.append((game.atlas_key("collectible", spec["file"], size=size, mask=spec.get("mask")),
+                          spec["file"], game.load_collectible_surface_from_spec(spec, scale=s)))
+    return items
+
+
+def pack(items, width=ATLAS_WIDTH, pad=PADDING):
+    """Einfacher Regal-Packer (nach Höhe sortiert). Gibt (Atlasgröße, {key: rect}) zurück."""
+    rects = {}
+    x = y = shelf_h = 0
+    for key, _, surf in sorted(items, key=lambda it: -it[2].get_height()):
+        w, h = surf.get_size()
+        if x + w > width:
+            x = 0
+            y += shelf_h + pad
+            shelf_h = 0
+        rects[key] = pygame.Rect(x, y, w, h)
+        x += w + pad
+        shelf_h = max(shelf_h, h)
+    return (width, y + shelf_h), rects
+
+
+def bake(scales=(1.0,)):
+    items = collect_items(scales)
+    size, rects = pack(items)
+    atlas = pygame.Surface(size, pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    entries = {}
+    sources = {}
+    for key, src, surf in items:
+        r = rects[key]
+        atlas.blit(surf, r)
+        entries[key] = {"rect": [r.x, r.y, r.w, r.h], "src": src}
+        sources[src] = game.source_digest(src)
+
+    base = os.path.dirname(os.path.abspath(game.__file__))
+    os.makedirs(os.path.join(base, os.path.dirname(game.ATLAS_IMAGE)), exist_ok=True)
+    pygame.image.save(atlas, os.path.join(base, game.ATLAS_IMAGE))
+    manifest = {
+        "version": 2,
+        "image": os.path.basename(game.ATLAS_IMAGE),
+        "size": list(size),
+        "sources": sources,
+        "entries": entries,
+    }
+    with open(os.path.join(base, game.ATLAS_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    kb = os.path.getsize(os.path.join(base, game.ATLAS_IMAGE)) / 1024
+    print(f"Atlas {size[0]}x{size[1]} mit {len(entries)} Bildern → {game.ATLAS_IMAGE} ({kb:.0f} KB)")
+
+
+def check():
+    """True, wenn der Manifest-Inhalt zu den aktuellen Quellen und Specs passt."""
+    try:
+        atlas = game.Atlas.load()
+    except Exception as e:
+        print("kein Atlas:", e)
+        return False
+    ok = True
+    for key, src, _ in collect_items():
+        if atlas.get(key) is None:
+            print("fehlt/veraltet:", key)
+            ok = False
+    print("Atlas aktuell." if ok else "Atlas neu backen: python bake_atlas.py")
+    return ok
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    # Immer aus den Quellbildern erzeugen, nie aus einem alten Atlas oder dem Bild-Cache
+    game.ATLAS_ENABLED = False
+    game.SURFACE_CACHE_ENABLED = False
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if check() else 1)
+    bake()
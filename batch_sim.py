@@ -0,0 +1,311 @@
+# batch_sim.py – viele FlappyAkh-Spiele gleichzeitig mit NumPy (für Balancing und Bots)
+# Benötigt numpy (nicht Teil des Spiels selbst):  pip install numpy
+#
+# Aufruf:  python batch_sim.py --games 10000 --frames 3000   → Durchsatz + Score-Statistik
+#          python batch_sim.py --parity                       → Frame-für-Frame-Vergleich mit World
+#                                                               (vorher: Gesichtsmasken Platzhalter = echt)
+#
+# Alle Regeln (Gravitation, Flap, Pipe.SPEED, Lücken, Collectibles, Kollision per Rechteck + Maske)
+# entsprechen main.World bei festen Sim-Schritten (SIM_DT); Positionen sind Floats, Rechtecke
+# werden wie im Spiel gerundet. Säulen und Collectibles kommen pro Spiel aus demselben
+# LevelStream(seed) wie dort.
+# Der Rechteck-Test läuft vektorisiert, die (seltenen) Treffer prüft danach die Maske pro Spiel.
+
+import sys
+import time
+import argparse
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("batch_sim.py benötigt numpy: pip install numpy")
+
+import main as game
+
+GROUND_Y = game.HEIGHT - 120
+SPAWN_X = game.WIDTH + 120
+PIPE_W = 60
+MAX_PIPES = 4        # gleichzeitig lebende Säulenpaare pro Spiel
+MAX_COLLECTIBLES = 2
+
+
+def _body_frames():
+    """(Index-Offset, w[], h[], Masken[]) der vorgedrehten Vogelbilder – dieselbe Tabelle wie im Spiel."""
+    frames = game.BirdFrames()
+    frames.build_body(game.make_placeholder_face())
+    lo = min(frames.body)
+    hi = max(frames.body)
+    w = np.array([frames.body[i].get_width() for i in range(lo, hi + 1)], dtype=np.int32)
+    h = np.array([frames.body[i].get_height() for i in range(lo, hi + 1)], dtype=np.int32)
+    return lo, w, h, [frames.masks[i] for i in range(lo, hi + 1)]
+
+
+def _pipe_mask(height, flipped):
+    return game.get_mask(game.get_pipe_surface(PIPE_W, height, flipped))
+
+
+class BatchSim:
+    """N unabhängige Spiele als Struct-of-Arrays. step(flap) rechnet für alle einen Frame."""
+
+    def __init__(self, n):
+        self.n = n
+        self.rot_lo, self.rot_w, self.rot_h, self.rot_masks = _body_frames()
+        # Collectible-Masken wie in World: aus den echten Sprites
+        self.spec_masks = [game.get_collectible_mask(s) for s in game.COLLECTIBLES]
+        self.step_deg = game.ROTATION_STEP
+        i32, f64 = np.int32, np.float64
+        # Vogel: Float-Mittelpunkt y + daraus gerundetes Rect (x, y, w, h)
+        self.y = np.zeros(n, f64)
+        self.bx = np.zeros(n, i32)
+        self.by = np.zeros(n, i32)
+        self.bw = np.zeros(n, i32)
+        self.bh = np.zeros(n, i32)
+        self.ridx = np.zeros(n, np.int64)   # Index der Rotationsstufe (für die Maske)
+        self.vel = np.zeros(n, f64)
+        self.alive = np.zeros(n, bool)
+        self.score = np.zeros(n, np.int64)
+        self.frame = np.zeros(n, np.int64)
+        # Säulenpaare: x (linker Rand, Float), Höhe oben, y-Oberkante unten
+        self.px = np.zeros((n, MAX_PIPES), f64)
+        self.top_h = np.zeros((n, MAX_PIPES), i32)
+        self.bot_y = np.zeros((n, MAX_PIPES), i32)
+        self.p_on = np.zeros((n, MAX_PIPES), bool)
+        self.scored = np.zeros((n, MAX_PIPES), bool)
+        self.newest_x = np.zeros(n, f64)
+        self.spacing = np.zeros(n, f64)     # Abstand bis zum nächsten Paar (aus dem Level-Stream)
+        # Collectibles (quadratisch: Kantenlänge inkl. Halo)
+        self.cx = np.zeros((n, MAX_COLLECTIBLES), f64)
+        self.cy = np.zeros((n, MAX_COLLECTIBLES), i32)
+        self.cs = np.zeros((n, MAX_COLLECTIBLES), i32)
+        self.cpts = np.zeros((n, MAX_COLLECTIBLES), np.int64)
+        self.cspec = np.zeros((n, MAX_COLLECTIBLES), np.int64)
+        self.c_on = np.zeros((n, MAX_COLLECTIBLES), bool)
+        self.levels = [None] * n
+
+    def reset(self, seeds):
+        seeds = list(seeds)
+        assert len(seeds) == self.n
+        self.levels = [game.LevelStream(seed) for seed in seeds]
+        self.spacing[:] = [level.peek().spacing for level in self.levels]
+        i0 = -self.rot_lo  # Rotation 0
+        w, h = self.rot_w[i0], self.rot_h[i0]
+        sx, sy = game.World.BIRD_START
+        self.y[:] = sy
+        self.bw[:] = w
+        self.bh[:] = h
+        self.bx[:] = sx - w // 2
+        self.by[:] = sy - h // 2
+        self.ridx[:] = i0
+        self.vel[:] = 0.0
+        self.alive[:] = True
+        self.score[:] = 0
+        self.frame[:] = 0
+        self.p_on[:] = False
+        self.scored[:] = False
+        self.c_on[:] = False
+
+    # --- Spawnen (selten → pro Spiel in Python, aus demselben Level-Stream wie World) ---
+    def _spawn(self, g):
+        level = self.levels[g]
+        seg = level.next()
+        self.spacing[g] = level.peek().spacing
+        bottom_h = GROUND_Y - seg.gap - seg.top_h
+        gap_center_y = seg.gap_y
+        slot = int(np.argmin(self.p_on[g]))
+        x = SPAWN_X - PIPE_W // 2
+        self.px[g, slot] = x
+        self.top_h[g, slot] = seg.top_h
+        self.bot_y[g, slot] = GROUND_Y - bottom_h
+        self.p_on[g, slot] = True
+        self.scored[g, slot] = False
+        self.newest_x[g] = x
+        spec = seg.item
+        if spec is not None:
+            size = spec.get("size", 64) + 20
+            slot = int(np.argmin(self.c_on[g]))
+            self.cx[g, slot] = SPAWN_X + 30 - size // 2
+            self.cy[g, slot] = gap_center_y - size // 2
+            self.cs[g, slot] = size
+            self.cpts[g, slot] = spec["points"]
+            self.cspec[g, slot] = game.COLLECTIBLES.index(spec)
+            self.c_on[g, slot] = True
+
+    def step(self, flap, dt=game.SIM_DT):
+        flap = np.asarray(flap, bool)
+        self.vel[flap] = -8.5
+        live = self.alive
+        if not live.any():
+            return
+        self.frame[live] += 1
+
+        has_pipes = self.p_on.any(axis=1)
+        need = live & (~has_pipes | (SPAWN_X - self.newest_x >= self.spacing))
+        for g in np.flatnonzero(need):
+            self._spawn(g)
+
+        # Vogel: Gravitation, Float-Schritt, vorgedrehtes Bild um die gerundete Mitte
+        self.vel[live] += 20.0 * dt
+        y = self.y[live] + self.vel[live] * dt * game.SIM_HZ
+        rot = np.clip(self.vel[live] * 3.5, game.BIRD_ROT_MIN, game.BIRD_ROT_MAX)
+        idx = np.rint(rot / self.step_deg).astype(np.int64) - self.rot_lo
+        idx = np.clip(idx, 0, len(self.rot_w) - 1)
+        w = self.rot_w[idx]
+        h = self.rot_h[idx]
+        sx = game.World.BIRD_START[0]
+        by = np.rint(y).astype(np.int32) - h // 2
+        top_hit = by < 0
+        y[top_hit] = h[top_hit] // 2
+        by[top_hit] = 0
+        self.y[live] = y
+        self.bw[live] = w
+        self.bh[live] = h
+        self.ridx[live] = idx
+        self.bx[live] = sx - w // 2
+        self.by[live] = by
+        v = self.vel[live]
+        v[top_hit] = 0.0
+        self.vel[live] = v
+
+        # Säulen + Collectibles scrollen und links entfernen (Rect-x = gerundete Float-Position)
+        step_px = game.Pipe.SPEED * dt
+        move = live[:, None]
+        self.px -= np.where(move & self.p_on, step_px, 0.0)
+        self.newest_x -= np.where(live, step_px, 0.0)
+        px = np.rint(self.px).astype(np.int32)
+        self.p_on &= ~(move & (px + PIPE_W < -5))
+        self.cx -= np.where(move & self.c_on, step_px, 0.0)
+        cx = np.rint(self.cx).astype(np.int32)
+        self.c_on &= ~(move & (cx + self.cs < -5))
+
+        bx, by, bw, bh = (a[:, None] for a in (self.bx, self.by, self.bw, self.bh))
+
+        # Kollisionen mit Säulen (obere: y=0..top_h, untere: bot_y..GROUND_Y)
+        x_overlap = (bx < px + PIPE_W) & (bx + bw > px)
+        hit_top = x_overlap & (by < self.top_h) & (by + bh > 0)
+        hit_bot = x_overlap & (by < GROUND_Y) & (by + bh > self.bot_y)
+        hit_top &= self.p_on & move
+        hit_bot &= self.p_on & move
+        for g, j in zip(*np.nonzero(hit_top)):
+            hit_top[g, j] = self._mask_hit(g, _pipe_mask(int(self.top_h[g, j]), False), px[g, j], 0)
+        for g, j in zip(*np.nonzero(hit_bot)):
+            hit_bot[g, j] = self._mask_hit(g, _pipe_mask(GROUND_Y - int(self.bot_y[g, j]), True),
+                                           px[g, j], self.bot_y[g, j])
+        crashed = live & (hit_top | hit_bot).any(axis=1)
+
+        # Collectibles einsammeln
+        got = (self.c_on & move & (bx < cx + self.cs) & (bx + bw > cx)
+               & (by < self.cy + self.cs) & (by + bh > self.cy))
+        for g, j in zip(*np.nonzero(got)):
+            got[g, j] = self._mask_hit(g, self.spec_masks[self.cspec[g, j]], cx[g, j], self.cy[g, j])
+        self.score += np.where(got, self.cpts, 0).sum(axis=1)
+        self.c_on &= ~got
+
+        # Boden
+        grounded = live & (self.by + self.bh >= GROUND_Y)
+        gh = self.bh[grounded]
+        self.y[grounded] = GROUND_Y - gh + gh // 2
+        self.by[grounded] = GROUND_Y - gh
+
+        # Punkte für passierte Säulen
+        passed = move & self.p_on & ~self.scored & (px + PIPE_W < bx)
+        self.score += passed.sum(axis=1)
+        self.scored |= passed
+
+        self.alive &= ~(crashed | grounded)
+
+    def _mask_hit(self, g, mask, x, y):
+        """Pixelgenaue Prüfung für einen Rechteck-Treffer (wie pygame.sprite.collide_mask)."""
+        offset = (int(x) - int(self.bx[g]), int(y) - int(self.by[g]))
+        return self.rot_masks[self.ridx[g]].overlap(mask, offset) is not None
+
+    def next_gap_y(self):
+        """Mitte der nächsten Lücke vor jedem Vogel (wie World.next_gap), sonst HEIGHT//2."""
+        px = np.rint(self.px)
+        ahead = self.p_on & (px + PIPE_W >= self.bx[:, None])
+        key = np.where(ahead, px, np.inf)
+        j = np.argmin(key, axis=1)
+        rows = np.arange(self.n)
+        gap_y = (self.top_h[rows, j] + self.bot_y[rows, j]) // 2
+        return np.where(ahead.any(axis=1), gap_y, game.HEIGHT // 2)
+
+    def bot_flaps(self):
+        """Vektorisierte Fassung von main.simple_bot."""
+        return (self.by + self.bh // 2 > self.next_gap_y() + 20) & (self.vel > 0)
+
+
+def run(n, frames, seed0=0):
+    sim = BatchSim(n)
+    sim.reset(range(seed0, seed0 + n))
+    t = time.perf_counter()
+    for _ in range(frames):
+        sim.step(sim.bot_flaps())
+        if not sim.alive.any():
+            break
+    dt = time.perf_counter() - t
+    played = int(sim.frame.sum())
+    print(f"{n} Spiele, {played} Spiel-Frames in {dt:.2f}s → {played / dt:,.0f} Frames/s")
+    print(f"Score: Mittel {sim.score.mean():.1f}, Median {np.median(sim.score):.0f}, Max {sim.score.max()}, "
+          f"noch lebendig {int(sim.alive.sum())}")
+    return sim
+
+
+def face_mask_parity(step=game.ROTATION_STEP):
+    """Platzhalter-Gesicht (headless World, BatchSim) gegen die echten Gesichter: Masken müssen in jeder
+    Rotationsstufe gleich sein, sonst gilt --parity nur für die headless World, nicht fürs Spiel."""
+    placeholder = game.BirdFrames(step)
+    placeholder.build_body(game.make_placeholder_face())
+    for c in game.CHARACTERS:
+        real = game.BirdFrames(step)
+        real.build_body(game.make_face_circle_from_file(c["avatar"], size=game.FACE_SIZE))
+        for i, mask in placeholder.masks.items():
+            other = real.masks[i]
+            if mask.get_size() != other.get_size() or mask.overlap_area(other, (0, 0)) != mask.count() \
+                    or mask.count() != other.count():
+                print(f"Gesichtsmaske {c['name']}, Stufe {i}: Platzhalter ≠ echtes Gesicht")
+                return False
+    return True
+
+
+def parity(seeds=range(50), frames=3000):
+    """Vergleicht jeden Frame von World (headless) und BatchSim. Gibt True bei voller Übereinstimmung."""
+    if not face_mask_parity():
+        return False
+    seeds = list(seeds)
+    sim = BatchSim(len(seeds))
+    sim.reset(seeds)
+    worlds = []
+    for seed in seeds:
+        w = game.World(headless=True)
+        w.reset(seed)
+        worlds.append(w)
+    for f in range(frames):
+        flaps = np.array([game.simple_bot(w) for w in worlds])
+        if not np.array_equal(flaps, sim.bot_flaps()):
+            print(f"Frame {f}: Bot-Entscheidungen weichen ab")
+            return False
+        for w, fl in zip(worlds, flaps):
+            w.step(game.SIM_DT, bool(fl))
+        sim.step(flaps)
+        for g, w in enumerate(worlds):
+            r = w.bird.rect
+            scalar = (r.x, r.y, r.w, r.h, w.bird.vel, w.bird.alive, w.score)
+            batch = (sim.bx[g], sim.by[g], sim.bw[g], sim.bh[g], sim.vel[g], sim.alive[g], sim.score[g])
+            if tuple(map(float, scalar)) != tuple(map(float, batch)):
+                print(f"Seed {seeds[g]}, Frame {f}: World {scalar} ≠ Batch {batch}")
+                return False
+        if not sim.alive.any():
+            break
+    print(f"Parität ok: {len(seeds)} Seeds, {f + 1} Frames, Scores {[w.score for w in worlds][:10]} …")
+    return True
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="FlappyAkh Batch-Simulator (NumPy)")
+    ap.add_argument("--games", type=int, default=10000)
+    ap.add_argument("--frames", type=int, default=3000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--parity", action="store_true", help="mit main.World vergleichen")
+    args = ap.parse_args()
+    if args.parity:
+        sys.exit(0 if parity(range(args.seed, args.seed + 50), args.frames) else 1)
+    run(args.games, args.frames, args.seed)
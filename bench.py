@@ -0,0 +1,451 @@
+# bench.py – Headless-Benchmarks für alle Zeichen- und Update-Hotpaths von FlappyAkh
+# Läuft mit SDL-Dummy-Treiber (kein Fenster).
+#
+# Aufruf:  python bench.py                    → alle Benchmarks, Ergebnis an bench_history.jsonl anhängen
+#          python bench.py --only bird        → nur Benchmarks, deren Name "bird" enthält
+#          python bench.py --save-baseline    → Ergebnis zusätzlich als bench_baseline.json speichern
+#          python bench.py --compare          → mit Baseline vergleichen, Exit-Code 1 bei Regression
+#          python bench.py --compare --threshold 0.05
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main as game
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(HERE, "bench_history.jsonl")
+BASELINE_FILE = os.path.join(HERE, "bench_baseline.json")
+
+BENCHMARKS = {}
+
+
+def benchmark(name, number=None, repeats=7):
+    """Registriert eine Setup-Funktion; sie gibt die zu messende Funktion (ohne Argumente) zurück.
+    number=None → Anzahl Aufrufe pro Messung wird automatisch kalibriert.
+    """
+    def deco(setup):
+        BENCHMARKS[name] = (setup, number, repeats)
+        return setup
+    return deco
+
+
+def measure(fn, number=None, repeats=7, min_time=0.05):
+    if number is None:
+        number = 1
+        while True:
+            t = time.perf_counter()
+            for _ in range(number):
+                fn()
+            if time.perf_counter() - t >= min_time:
+                break
+            number *= 2
+    times = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t) / number * 1e6)
+    times.sort()
+    return {"median_us": times[len(times) // 2], "min_us": times[0], "calls": number}
+
+
+# --- Gemeinsame Objekte ---
+_screen = None
+
+
+def screen():
+    global _screen
+    if _screen is None:
+        pygame.init()
+        _screen = pygame.display.set_mode((game.WIDTH, game.HEIGHT))
+    return _screen
+
+
+def busy_world(seed=1, steps=400, headless=False):
+    """Welt mitten im Lauf (mehrere Säulen + Items auf dem Schirm)."""
+    screen()
+    world = game.World(headless=headless) if headless else game.World(game.make_face_circle_from_file(
+        game.CHARACTERS[0]["avatar"], size=game.FACE_SIZE))
+    game.run_headless(seed, steps, world=world)
+    return world
+
+
+# --- Einzelne Hotpaths ---
+@benchmark("draw_background")
+def _():
+    s = screen()
+    return lambda: game.draw_background(s)
+
+
+@benchmark("bird.update+draw_wings")
+def _():
+    s = screen()
+    bird = game.Bird(100, game.HEIGHT // 2, game.make_face_circle_from_file(game.CHARACTERS[0]["avatar"]))
+
+    def run():
+        if bird.y > game.HEIGHT - 200:
+            bird.flap()
+        bird.update(game.SIM_DT)
+        bird.draw_wings(s)
+    return run
+
+
+@benchmark("bird.render")
+def _():
+    s = screen()
+    bird = game.Bird(100, game.HEIGHT // 2, game.make_face_circle_from_file(game.CHARACTERS[0]["avatar"]))
+    return lambda: bird.render(s, 0.5)
+
+
+@benchmark("collectible.construct")
+def _():
+    screen()
+    game.warm_collectible_cache()
+    spec = game.COLLECTIBLES[2]
+    return lambda: game.Collectible(spec, 300, 300)
+
+
+@benchmark("scorepopup.update")
+def _():
+    screen()
+    popup = game.ScorePopup(200, 300, "+10", (255, 230, 80))
+
+    def run():
+        popup.update(game.SIM_DT)
+        if popup.t >= popup.duration:
+            popup.reset(200, 300, "+10", (255, 230, 80))
+    return run
+
+
+@benchmark("pipe.spawn")
+def _():
+    screen()
+    group_all, group_pipes = pygame.sprite.Group(), pygame.sprite.Group()
+    pool = game.SpritePool(game.Pipe)
+
+    def run():
+        top, bottom, _ = game.spawn_pipe_pair(group_all, group_pipes, game.WIDTH + 120, pool)
+        top.release()
+        bottom.release()
+    return run
+
+
+@benchmark("world.collide")
+def _():
+    world = busy_world(headless=True)
+    events = []
+
+    def run():
+        events.clear()
+        world.collide(events)
+    return run
+
+
+@benchmark("world.collide (narrow phase)")
+def _():
+    # Schlimmster Fall: Vogel-Rect überlappt jedes Mal die Ecke einer Säule, die Masken aber nicht
+    # → jede Prüfung läuft bis in die Maske. Rotation wechselt pro Aufruf durch alle Stufen.
+    world = game.World(headless=True)
+    bird = world.bird
+    pipe = world.pools["pipe"].acquire(200, 300)
+    world.pipes.add(pipe)
+    stages = []
+    for i in sorted(bird.frames.body):
+        bird.rotation = i * bird.frames.step
+        bird._set_frame()
+        rect = bird.image.get_rect(topleft=(pipe.rect.right - 4, pipe.rect.bottom - 4))
+        stages.append((bird.rotation, float(rect.centerx), float(rect.centery)))
+    events = []
+    n = len(stages)
+    it = [0]
+
+    def run():
+        bird.rotation, bird.x, bird.y = stages[it[0] % n]
+        it[0] += 1
+        bird._set_frame()
+        bird._sync_rect()
+        events.clear()
+        world.collide(events)
+        assert bird.alive
+    return run
+
+
+@benchmark("world.step (headless)")
+def _():
+    world = game.World(headless=True)
+    world.reset(7)
+
+    def run():
+        world.step(game.SIM_DT, game.simple_bot(world))
+        if not world.bird.alive:
+            world.reset(7)
+    return run
+
+
+@benchmark("draw_world")
+def _():
+    s = screen()
+    world = busy_world()
+    ground = game.Ground()
+    return lambda: game.draw_world(s, world, ground, (), 0.5)
+
+
+# Zeichenkosten je Qualitätsstufe (was der QualityGovernor einsparen kann)
+for _tier in game.QUALITY_TIERS:
+    @benchmark(f"draw_world [{_tier['name']}]")
+    def _(tier=_tier):
+        s = screen()
+        world = busy_world()
+        ground = game.Ground()
+        game.QUALITY.update(tier)
+        return lambda: game.draw_world(s, world, ground, (), 0.5)
+
+
+# Doppelte Auflösung: pro Maßstab neu gebackene Bilder vs. fertigen 1×-Frame hochskalieren
+@benchmark("draw_frame [2x, neu gebacken]")
+def _():
+    screen()
+    target = pygame.Surface(game.window_size(2.0))
+    view = game.View(target, 2.0)
+    world = busy_world()
+    ground = game.Ground()
+
+    def run():
+        view.background.draw(target)
+        target.blits(view.items(game.world_draw_list(world, ground, (), 0.5)))
+    run()   # Cache füllen (einmal pro Maßstab)
+    return run
+
+
+@benchmark("draw_frame [2x, Framebuffer skaliert]")
+def _():
+    s = screen()
+    frame = pygame.Surface(s.get_size())
+    target = pygame.Surface(game.window_size(2.0))
+    world = busy_world()
+    ground = game.Ground()
+    background = game.get_background(s.get_size())
+
+    def run():
+        background.draw(frame)
+        game.draw_world(frame, world, ground, (), 0.5)
+        pygame.transform.smoothscale(frame, target.get_size(), target)
+    return run
+
+
+# --- Skalierung der Broad-Phase (10 … 10.000 Items entlang eines langen Levels) ---
+def crowded_world(n, spacing=24):
+    """Headless-Welt mit n Collectibles im Abstand spacing (über dem Vogel, damit keins eingesammelt wird)."""
+    world = game.World(headless=True)
+    world.reset(1)
+    spec = game.COLLECTIBLES[0]
+    image = world._collectible_image(spec)
+    for i in range(n):
+        col = world.pools["collectible"].acquire(spec, i * spacing, 60 + (i * 37) % 120, image)
+        world.collectibles.add(col)
+    return world
+
+
+for _n in (10, 100, 1000, 10000):
+    @benchmark(f"broad.collide [{_n}]")
+    def _(n=_n):
+        world = crowded_world(n)
+        events = []
+
+        def run():
+            events.clear()
+            world.collide(events)
+        return run
+
+    @benchmark(f"broad.linear_scan [{_n}]")
+    def _(n=_n):
+        # Vergleich: alter Weg, jedes Item gegen den Vogel testen
+        world = crowded_world(n)
+        bird = world.bird
+        return lambda: [c for c in world.collectibles if bird.rect.colliderect(c.rect)]
+
+    @benchmark(f"broad.draw_list [{_n}]")
+    def _(n=_n):
+        world = crowded_world(n)
+        ground = game.Ground()
+        return lambda: game.world_draw_list(world, ground, (), 0.5)
+
+
+# --- Geister: ein gemeinsamer Bildsatz + ein blits() vs. Bird.render pro Geist ---
+def ghost_world():
+    return busy_world(steps=100)
+
+
+for _n in (50, 500):
+    @benchmark(f"ghosts.draw [{_n}]")
+    def _(n=_n):
+        s = screen()
+        world = ghost_world()
+        layer = game.GhostLayer(world.bird.frames, game.stress_ghosts(1, n, ticks=600))
+        view = game.View(s, 1.0)
+        return lambda: layer.draw(s, view, 100, 0.5)
+
+    @benchmark(f"ghosts.bird_render [{_n}]")
+    def _(n=_n):
+        # Vergleich: jeder Geist als eigener Vogel (Flügel, Schatten, eigenes blits)
+        s = screen()
+        bird = ghost_world().bird
+
+        def run():
+            for _ in range(n):
+                bird.render(s, 0.5)
+        return run
+
+
+@benchmark("ghosts.record [0.25°]", number=1, repeats=3)
+def _():
+    # Feine Rotationsstufen: Stufenindex passt nicht mehr in ein Byte; Bahn muss Datei-Rundreise und
+    # Umrechnung auf den 1°-Bildsatz überstehen
+    world = game.World(headless=True)
+    world.bird.frames = game.BirdFrames(0.25)
+    world.bird.frames.build_body(world.bird.base_image)
+    layer = game.GhostLayer(ghost_world().bird.frames)
+
+    def run():
+        track = game.GhostTrack.from_world(game.run_headless(1, 600, world=world))
+        back = game.GhostTrack.from_bytes(track.to_bytes())
+        assert (back.ys, back.rots, back.step) == (track.ys, track.rots, 0.25)
+        assert max(map(abs, track.rots)) > 127
+        layer.add(back)
+    return run
+
+
+# --- Szenarien (ganze Läufe, je ein Aufruf) ---
+@benchmark("scenario.headless_10k", number=1, repeats=3)
+def _():
+    world = game.World(headless=True)
+
+    def run():
+        world.reset(3)
+        for _ in range(10000):
+            world.step(game.SIM_DT, game.simple_bot(world))
+            if not world.bird.alive:
+                world.reset(world.seed + 1)
+    return run
+
+
+@benchmark("scenario.render_10k", number=1, repeats=3)
+def _():
+    s = screen()
+    world = busy_world(steps=0)
+    ground = game.Ground()
+    background = game.get_background(s.get_size())
+
+    def run():
+        world.reset(3)
+        for _ in range(10000):
+            world.step(game.SIM_DT, game.simple_bot(world))
+            if not world.bird.alive:
+                world.reset(world.seed + 1)
+            ground.update(game.SIM_DT)
+            background.draw(s)
+            game.draw_world(s, world, ground, ())
+            pygame.display.flip()
+    return run
+
+
+@benchmark("scenario.render_10k_dirty", number=1, repeats=3)
+def _():
+    s = screen()
+    world = busy_world(steps=0)
+    ground = game.Ground()
+    renderer = game.DirtyRenderer(s, game.get_background(s.get_size()))
+
+    def run():
+        world.reset(3)
+        renderer.invalidate()
+        for _ in range(10000):
+            world.step(game.SIM_DT, game.simple_bot(world))
+            if not world.bird.alive:
+                world.reset(world.seed + 1)
+            ground.update(game.SIM_DT)
+            renderer.present(game.world_draw_list(world, ground, ()))
+    return run
+
+
+# --- Ablauf, Historie, Vergleich ---
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_all(only=None):
+    results = {}
+    for name, (setup, number, repeats) in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        r = measure(setup(), number, repeats)
+        game.QUALITY.update(game.QUALITY_TIERS[0])   # falls der Benchmark die Stufe umgestellt hat
+        results[name] = r
+        print(f"{name:<28} {r['median_us']:>12.2f} µs  (min {r['min_us']:.2f}, {r['calls']} Aufrufe)")
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\nVergleich mit Baseline ({baseline.get('rev') or '?'}, {baseline.get('time', '?')}):")
+    for name, r in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<28} neu")
+            continue
+        ratio = r["median_us"] / base["median_us"] - 1.0
+        mark = ""
+        if ratio > threshold:
+            mark = "  ← REGRESSION"
+            regressions.append(name)
+        elif ratio < -threshold:
+            mark = "  ← schneller"
+        print(f"{name:<28} {base['median_us']:>10.2f} → {r['median_us']:>10.2f} µs  ({ratio:+.1%}){mark}")
+    return regressions
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="FlappyAkh Benchmarks")
+    ap.add_argument("--only", help="nur Benchmarks, deren Name diesen Text enthält")
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--compare", action="store_true")
+    ap.add_argument("--threshold", type=float, default=0.10, help="erlaubte Verlangsamung (0.10 = 10 %%)")
+    ap.add_argument("--no-history", action="store_true")
+    args = ap.parse_args()
+
+    results = run_all(args.only)
+    record = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "rev": git_rev(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if not args.no_history:
+        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=1)
+        print("Baseline gespeichert:", BASELINE_FILE)
+    if args.compare:
+        if not os.path.exists(BASELINE_FILE):
+            sys.exit("keine Baseline – erst mit --save-baseline anlegen")
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
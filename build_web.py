@@ -0,0 +1,93 @@
+# build_web.py – baut das Web-Bundle, das docs/index.html über pygbag lädt (docs/flappyakh.apk)
+# Aufruf:  python build_web.py               → Atlas backen, Bundle packen, Bericht ausgeben
+#          python build_web.py --out DATEI   → Bundle woanders hin schreiben
+#
+# Im Bundle steckt nur, was der Browser braucht: main.py und der Atlas mit allen Bildern bereits in
+# Bildschirmgröße (48–140 px), zusätzlich in den HiDPI-Maßstäben aus main.WEB_SCALES. Quellbilder, Tools
+# und die Alt-Version FlappyAkh.py bleiben draußen; main.py erkennt fehlende Quellen, die der Atlas
+# abdeckt, lädt alles aus dem Atlas und rundet den Browser-Maßstab auf einen mitgebackenen ab.
+
+import os
+import json
+import time
+import zipfile
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import main as game
+import bake_atlas
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VERSION_FILE = os.path.join("build", "version.txt")
+DEFAULT_OUT = os.path.join("docs", "flappyakh.apk")
+CODE_FILES = ["main.py"]
+IMAGE_EXT = (".png", ".jpg", ".jpeg")
+
+
+def read_version():
+    with open(os.path.join(HERE, VERSION_FILE), encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def raw_assets():
+    """Bilder, die ein unbearbeitetes Bundle (ganzer Projektordner) mitschleppen würde."""
+    return sorted(f for f in os.listdir(HERE) if f.lower().endswith(IMAGE_EXT))
+
+
+def decode_ms(paths):
+    t = time.perf_counter()
+    for p in paths:
+        pygame.image.load(os.path.join(HERE, p))
+    return (time.perf_counter() - t) * 1000
+
+
+def build(out, version):
+    # Atlas immer frisch aus den Quellen backen (gleiche Einstellungen wie bake_atlas.py)
+    game.ATLAS_ENABLED = False
+    game.SURFACE_CACHE_ENABLED = False
+    bake_atlas.bake(game.WEB_SCALES)
+
+    files = CODE_FILES + [game.ATLAS_IMAGE, game.ATLAS_MANIFEST]
+    out_path = os.path.join(HERE, out)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    # pygbag-Archiv: normales ZIP, App-Dateien unter assets/
+    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for name in files:
+            # PNG ist schon komprimiert → nur speichern
+            kind = zipfile.ZIP_STORED if name.endswith(".png") else zipfile.ZIP_DEFLATED
+            zf.write(os.path.join(HERE, name), "assets/" + name.replace(os.sep, "/"), compress_type=kind)
+        zf.writestr("assets/" + VERSION_FILE.replace(os.sep, "/"), version + "\n")
+        zf.comment = f"FlappyAkh {version}".encode()
+    return files, out_path
+
+
+def report(files, out_path, version):
+    raw = raw_assets()
+    raw_bytes = sum(os.path.getsize(os.path.join(HERE, f)) for f in raw)
+    print(f"\nFlappyAkh Web-Bundle {version} → {os.path.relpath(out_path, HERE)}")
+    for name in files:
+        print(f"  {name:<22} {os.path.getsize(os.path.join(HERE, name)) / 1024:>8.1f} KB")
+    bundle = os.path.getsize(out_path)
+    print(f"  {'= Archiv':<22} {bundle / 1024:>8.1f} KB")
+    print(f"\nRohbilder ({len(raw)} Dateien): {raw_bytes / 1024:.0f} KB → Atlas "
+          f"{os.path.getsize(os.path.join(HERE, game.ATLAS_IMAGE)) / 1024:.0f} KB")
+    print(f"Archiv gesamt: {bundle / raw_bytes:.1%} der Rohbilder")
+    print(f"Dekodieren: Rohbilder {decode_ms(raw):.0f} ms, Atlas {decode_ms([game.ATLAS_IMAGE]):.0f} ms")
+    with open(os.path.join(HERE, game.ATLAS_MANIFEST), encoding="utf-8") as f:
+        baked = json.load(f)["sources"]
+    dropped = sorted(set(raw) - set(baked))
+    if dropped:
+        print("Nicht benutzt (weggelassen):", ", ".join(dropped))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="FlappyAkh Web-Bundle für pygbag")
+    ap.add_argument("--out", default=DEFAULT_OUT)
+    args = ap.parse_args()
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    version = read_version()
+    files, out_path = build(args.out, version)
+    report(files, out_path, version)
@@ -4,9 +4,24 @@
 
 import os
 import sys
+import json
+import gc
+import struct
+import zlib
+import shutil
+import hashlib
+import time
 import random
+import asyncio
+import threading
+import weakref
+import functools
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
 import pygame
 import math
+import bisect
+from collections import OrderedDict, deque
 
 IS_WEB = (sys.platform == "emscripten")
 
@@ -18,9 +33,20 @@ def dbg(*a):
         
 # --- Grundeinstellungen ---
 WIDTH, HEIGHT = 432, 768
-FPS = 60
+FPS = 60                 # Bildrate der Anzeige (darf höher sein, z. B. 120/144)
+SIM_HZ = 60              # feste Simulationsrate – bestimmt die Spielgeschwindigkeit
+SIM_DT = 1.0 / SIM_HZ
+MAX_FRAME_DT = 0.25      # längere Frames (Hänger, Tab im Hintergrund) werden gekappt
+MAX_SIM_STEPS = 5        # höchstens so viele Sim-Schritte pro angezeigtem Frame
+LOW_LATENCY = False      # True (--low-latency / F9): bei Eingabe sofort aufwachen, Flaps im selben Frame zeigen
 TITLE = "FlappyAkh"
 
+# Endgrößen der Bilder (auch vom Atlas-Baker verwendet)
+FACE_SIZE = 72
+SKIN_SIZE = (140, 140)
+WING_SIZE = (48, 48)
+WING_FILES = ("LinkerFluegel.png", "RechterFluegel.png")
+
 # Farben
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -57,9 +83,9 @@ COLLECTIBLE_EVERY = 2        # alle N Säulenpaare
 COLLECTIBLE_PROB  = 0.75     # und zusätzlich diese Wahrscheinlichkeit
 
 
-def weighted_choice(items, weight_key="weight"):
+def weighted_choice(items, weight_key="weight", rng=random):
     total = sum(i[weight_key] for i in items)
-    r = random.uniform(0, total)
+    r = rng.uniform(0, total)
     acc = 0.0
     for i in items:
         acc += i[weight_key]
@@ -68,6 +94,47 @@ def weighted_choice(items, weight_key="weight"):
     return items[-1]
 
 # --- Hilfsfunktionen ---
+def spec_key(spec: dict) -> tuple:
+    """Hashbarer Schlüssel aus dem Inhalt einer Konfig-Spec (für Caches)."""
+    return tuple(sorted(spec.items()))
+
+
+def on_main_thread() -> bool:
+    return threading.current_thread() is threading.main_thread()
+
+
+def has_display_format() -> bool:
+    """Gibt es ein Anzeigeformat zum Konvertieren? Nicht im Worker-Thread und nicht ohne Fenster
+    (headless World, Replay-Tool, Batch-Simulator)."""
+    return on_main_thread() and pygame.display.get_surface() is not None
+
+
+def _to_display(surf: pygame.Surface) -> pygame.Surface:
+    """convert() mit Anzeigeformat; sonst bleibt das dekodierte Format (Colorkey geht auch so)."""
+    return surf.convert() if has_display_format() else surf
+
+
+def _to_alpha(surf: pygame.Surface) -> pygame.Surface:
+    """convert_alpha() mit Anzeigeformat. Ohne (Worker, kein Fenster) gleiches Ergebnis über eine
+    eigene Alpha-Surface (Colorkey-Pixel: Farbe bleibt, Alpha 0 – wie bei convert_alpha)."""
+    if has_display_format():
+        return surf.convert_alpha()
+    key = surf.get_colorkey()
+    if surf.get_flags() & pygame.SRCALPHA:
+        if key is None:
+            return surf
+        out = surf.copy()
+        out.set_colorkey(None)
+        pygame.mask.from_threshold(surf, key, (1, 1, 1, 255)).to_surface(
+            out, setcolor=(key[0], key[1], key[2], 0), unsetcolor=None)
+        return out
+    out = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+    if key is not None:
+        out.fill((key[0], key[1], key[2], 0))
+    out.blit(surf, (0, 0))
+    return out
+
+
 def load_image_local(filename: str) -> pygame.Surface:
     """Lädt ein Bild (APK/web-tauglich). Versucht Pfad + Fallback nur-Dateiname.
     Wirft bei Fehlern eine RuntimeError, die später hübsch angezeigt wird.
@@ -79,17 +146,307 @@ def load_image_local(filename: str) -> pygame.Surface:
     last_err = None
     for p in try_paths:
         try:
-            surf = pygame.image.load(p).convert_alpha()
+            # Im Worker-Thread (AssetLoader) ohne Anzeigeformat; convert_alpha folgt im Hauptthread
+            surf = _to_alpha(pygame.image.load(p))
             dbg("loaded:", p)
             return surf
         except Exception as e:
             last_err = e
     raise RuntimeError(f"Bild konnte nicht geladen werden: {filename} ({last_err})")
 
-def make_face_circle_from_file(filename: str, size: int = 72) -> pygame.Surface:
+
+# --- Rezepte: Bilder in einem anderen Maßstab neu backen (für View, auflösungsunabhängiges Zeichnen) ---
+# Alles wird in logischen Pixeln (WIDTH×HEIGHT) erzeugt. Ein Rezept am Bild sagt, wie es im Maßstab
+# view.scale frisch entsteht (Quelle neu skalieren, Text neu rendern, Säule neu zeichnen …);
+# Bilder ohne Rezept skaliert die View einmal geglättet.
+_RECIPES = weakref.WeakKeyDictionary()   # Surface → recipe(view) → Surface im Maßstab view.scale
+
+
+def set_recipe(surf, recipe):
+    _RECIPES[surf] = recipe
+    return surf
+
+
+def copy_recipe(src, dst):
+    """Rezept übernehmen, z. B. nach convert_alpha() oder .copy()."""
+    recipe = _RECIPES.get(src)
+    if recipe is not None and dst is not src:
+        _RECIPES[dst] = recipe
+    return dst
+
+
+def rebakeable(builder):
+    """Dekorator für Bild-Builder mit scale-Parameter: das Ergebnis bekommt denselben Aufruf mit
+    scale=view.scale als Rezept."""
+    @functools.wraps(builder)
+    def build(*args, **kwargs):
+        return set_recipe(builder(*args, **kwargs),
+                          lambda view: builder(*args, **dict(kwargs, scale=view.scale)))
+    return build
+
+# --- Textur-Atlas (vorgebacken mit bake_atlas.py) ---
+# Enthält alle Bilder bereits in Endgröße und freigestellt → Start = ein kleiner Decode.
+ATLAS_IMAGE = os.path.join("build", "atlas.png")
+ATLAS_MANIFEST = os.path.join("build", "atlas.json")
+ATLAS_ENABLED = True   # bake_atlas.py schaltet das ab, um aus den Quellbildern zu backen
+
+
+def atlas_key(kind: str, filename: str, **params) -> str:
+    """Manifest-Schlüssel: Art + Quelldatei + Verarbeitungsparameter (Größe, Maske, …)."""
+    return f"{kind}:{filename}:" + json.dumps(params, sort_keys=True)
+
+
+_SOURCE_HASHES = {}   # Pfad → ((mtime, Größe), Hash); neu gehasht wird nur, wenn sich der Stempel ändert
+
+
+def source_digest(filename: str):
+    """Inhalts-Hash einer Quelldatei (Atlas und Bild-Cache erkennen daran geänderte Bilder, auch bei
+    gleicher Dateigröße). None, wenn die Quelle fehlt (z. B. Web-Bundle)."""
+    for p in (os.path.join(os.path.dirname(__file__), filename), filename):
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        stamp = (st.st_mtime_ns, st.st_size)
+        known = _SOURCE_HASHES.get(p)
+        if known is None or known[0] != stamp:
+            with open(p, "rb") as f:
+                known = _SOURCE_HASHES[p] = (stamp, hashlib.blake2b(f.read(), digest_size=16).hexdigest())
+        return known[1]
+    return None
+
+
+class Atlas:
+    """Ein großes Bild + JSON-Manifest; verteilt Subsurfaces pro Schlüssel."""
+
+    def __init__(self, image: pygame.Surface, manifest: dict):
+        self.image = image
+        self.manifest = manifest
+        self.entries = manifest.get("entries", {})
+        self.sources = manifest.get("sources", {})
+        self._subs = {}
+
+    @staticmethod
+    def read(image_path=ATLAS_IMAGE, manifest_path=ATLAS_MANIFEST):
+        """(Bild, Manifest) von der Platte; läuft auch im Worker-Thread (Bild dann unkonvertiert)."""
+        base = os.path.dirname(__file__)
+        with open(os.path.join(base, manifest_path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return load_image_local(image_path), manifest
+
+    @classmethod
+    def load(cls, image_path=ATLAS_IMAGE, manifest_path=ATLAS_MANIFEST):
+        return cls(*cls.read(image_path, manifest_path))
+
+    def get(self, key: str):
+        """Subsurface für key oder None, falls fehlend oder die Quelldatei sich geändert hat."""
+        sub = self._subs.get(key)
+        if sub is not None:
+            return sub
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        src = entry.get("src")
+        if src is not None:
+            digest = source_digest(src)   # Quelle nicht mitgeliefert (Web-Bundle) → Atlas vertrauen
+            if digest is not None and digest != self.sources.get(src):
+                dbg("atlas veraltet für", src, "→ lade Quelle")
+                return None
+        sub = self._subs[key] = self.image.subsurface(pygame.Rect(entry["rect"]))
+        return sub
+
+
+_ATLAS = None
+_ATLAS_TRIED = False
+
+
+def get_atlas():
+    """Lädt den Atlas beim ersten Zugriff; None, wenn keiner gebacken wurde."""
+    global _ATLAS, _ATLAS_TRIED
+    if not ATLAS_ENABLED:
+        return None
+    if not _ATLAS_TRIED:
+        _ATLAS_TRIED = True
+        try:
+            _ATLAS = Atlas.load()
+            dbg("atlas:", len(_ATLAS.entries), "Einträge")
+        except Exception as e:
+            dbg("kein Atlas, lade Einzelbilder:", e)
+            _ATLAS = None
+    return _ATLAS
+
+
+def atlas_sources():
+    """Quelldateien, die der gebackene Atlas abdeckt (nur das Manifest lesen, nicht das Bild)."""
+    if not ATLAS_ENABLED:
+        return set()
+    try:
+        with open(os.path.join(os.path.dirname(__file__), ATLAS_MANIFEST), "r", encoding="utf-8") as f:
+            return set(json.load(f).get("sources", {}))
+    except (OSError, ValueError):
+        return set()
+
+
+def install_atlas(loaded):
+    """Ergebnis von Atlas.read aus dem AssetLoader übernehmen (Hauptthread: hier erst convert_alpha)."""
+    global _ATLAS, _ATLAS_TRIED
+    _ATLAS_TRIED = True
+    if loaded is None:
+        _ATLAS = None
+        return None
+    image, manifest = loaded
+    _ATLAS = Atlas(image.convert_alpha(), manifest)
+    dbg("atlas:", len(_ATLAS.entries), "Einträge")
+    return _ATLAS
+
+
+def atlas_lookup(kind: str, filename: str, **params):
+    atlas = get_atlas()
+    if atlas is None:
+        return None
+    return atlas.get(atlas_key(kind, filename, **params))
+
+
+# --- Bild-Cache auf der Platte (fertig verarbeitete Pixel, überlebt Neustarts) ---
+# Ergänzt den Atlas: greift für alles, was nicht (oder veraltet) im Atlas steht. Schlüssel = Hash der
+# Quelldatei + Verarbeitungsparameter → geänderte Quelle = neuer Schlüssel, alter Eintrag altert raus.
+SURFACE_CACHE_DIR = os.path.join("build", "surface_cache")
+SURFACE_CACHE_VERSION = 1           # erhöhen, wenn sich eine Verarbeitung ändert (alte Einträge fliegen raus)
+SURFACE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+SURFACE_CACHE_ENABLED = not IS_WEB  # bake_atlas.py schaltet ab, damit der Atlas aus den Quellen entsteht
+
+
+class SurfaceCache:
+    """Ein Verzeichnis pro Version, eine Datei pro Eintrag: Kopf (Magic, w, h) + zlib-komprimiertes RGBA.
+    Über max_bytes fliegen die am längsten nicht benutzten Einträge raus (mtime = letzter Zugriff).
+    """
+    MAGIC = b"FAKS"
+    HEADER = struct.Struct("<4sHH")
+
+    def __init__(self, root=SURFACE_CACHE_DIR, version=SURFACE_CACHE_VERSION, max_bytes=SURFACE_CACHE_MAX_BYTES):
+        self.root = os.path.join(os.path.dirname(__file__), root)
+        self.dir = os.path.join(self.root, f"v{version}")
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()    # AssetLoader-Worker lesen/schreiben parallel
+        self._total = None
+        self.hits = self.misses = 0
+
+    def path(self, kind, filename, **params):
+        digest = source_digest(filename)
+        if digest is None:
+            return None   # Quelle fehlt (z. B. Web-Bundle) → nicht cachen
+        key = hashlib.blake2b(atlas_key(kind, filename, src=digest, **params).encode(), digest_size=16)
+        return os.path.join(self.dir, key.hexdigest() + ".rgba.z")
+
+    def get(self, kind, filename, **params):
+        path = self.path(kind, filename, **params)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, w, h = self.HEADER.unpack_from(data)
+            if magic != self.MAGIC:
+                raise ValueError("kein Cache-Eintrag")
+            surf = pygame.image.frombytes(zlib.decompress(data[self.HEADER.size:]), (w, h), "RGBA")
+        except (OSError, TypeError, ValueError, struct.error, zlib.error, pygame.error):
+            self.misses += 1
+            return None
+        os.utime(path)   # zuletzt benutzt → überlebt die Verdrängung länger
+        self.hits += 1
+        return _to_alpha(surf)
+
+    def put(self, kind, filename, surf, **params):
+        path = self.path(kind, filename, **params)
+        if path is None:
+            return surf
+        w, h = surf.get_size()
+        data = self.HEADER.pack(self.MAGIC, w, h) + zlib.compress(pygame.image.tobytes(surf, "RGBA"), 1)
+        try:
+            with self.lock:
+                if self._total is None:
+                    self._prune_versions()
+                    os.makedirs(self.dir, exist_ok=True)
+                    self._total = sum(e.stat().st_size for e in os.scandir(self.dir))
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                self._total += len(data)
+                if self._total > self.max_bytes:
+                    self._evict()
+        except OSError as e:
+            dbg("Bild-Cache nicht beschreibbar:", e)
+        return surf
+
+    def _prune_versions(self):
+        """Verzeichnisse anderer Cache-Versionen löschen."""
+        try:
+            for entry in os.scandir(self.root):
+                if entry.is_dir() and entry.path != self.dir:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = sorted(os.scandir(self.dir), key=lambda e: e.stat().st_mtime)
+        for entry in entries:
+            if self._total <= self.max_bytes * 0.9:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+                self._total -= size
+            except OSError:
+                pass
+
+
+_SURFACE_CACHE = None
+
+
+def get_surface_cache():
+    global _SURFACE_CACHE
+    if not SURFACE_CACHE_ENABLED:
+        return None
+    if _SURFACE_CACHE is None:
+        _SURFACE_CACHE = SurfaceCache()
+    return _SURFACE_CACHE
+
+
+def disk_cache_get(kind, filename, **params):
+    cache = get_surface_cache()
+    return cache.get(kind, filename, **params) if cache is not None else None
+
+
+def disk_cache_put(kind, filename, surf, **params):
+    cache = get_surface_cache()
+    return cache.put(kind, filename, surf, **params) if cache is not None else surf
+
+
+@rebakeable
+def load_scaled_image(filename: str, size, scale=1.0) -> pygame.Surface:
+    """Lädt ein Bild in Endgröße (aus dem Atlas, sonst Quelle + smoothscale)."""
+    w, h = round(size[0] * scale), round(size[1] * scale)
+    surf = atlas_lookup("scaled", filename, size=[w, h]) or disk_cache_get("scaled", filename, size=[w, h])
+    if surf is not None:
+        return surf
+    return disk_cache_put("scaled", filename, pygame.transform.smoothscale(load_image_local(filename), (w, h)),
+                          size=[w, h])
+
+@rebakeable
+def make_face_circle_from_file(filename: str, size: int = 72, scale=1.0) -> pygame.Surface:
     """Lädt ein Bild, skaliert es auf size x size und cropt es kreisförmig mit dünnem Rand."""
+    size = round(size * scale)
+    cached = atlas_lookup("face", filename, size=size) or disk_cache_get("face", filename, size=size)
+    if cached is not None:
+        return cached
     img = load_image_local(filename)
     img = pygame.transform.smoothscale(img, (size, size))
+    return disk_cache_put("face", filename, crop_face_circle(img), size=size)
+
+
+def crop_face_circle(img: pygame.Surface) -> pygame.Surface:
+    """Quadratisches Bild kreisförmig zuschneiden und mit dünnem Rand versehen. Einzige Stelle für die
+    Gesichtsform – der Platzhalter der headless World nutzt sie auch, damit die Masken gleich sind."""
+    size = img.get_width()
     circle_mask = pygame.Surface((size, size), pygame.SRCALPHA)
     pygame.draw.circle(circle_mask, (255, 255, 255, 255), (size // 2, size // 2), size // 2)
 
@@ -100,7 +457,8 @@ def make_face_circle_from_file(filename: str, size: int = 72) -> pygame.Surface:
     return face_circle
 
 # --- Collectible-Hilfsfunktion (mit Freistellung) ---
-def load_collectible_surface_from_spec(spec: dict) -> pygame.Surface:
+@rebakeable
+def load_collectible_surface_from_spec(spec: dict, scale=1.0) -> pygame.Surface:
     """Lädt das Collectible-Bild, stellt es optional frei und skaliert auf spec['size'].
     Unterstützte spec["mask"]:
       - "autokey": Hintergrundfarbe vom Pixel (0,0) als transparent setzen (für JPG mit einfarbigem BG).
@@ -109,7 +467,12 @@ def load_collectible_surface_from_spec(spec: dict) -> pygame.Surface:
          und die Kreis-Zuschnitthilfe auf das **Inhaltszentrum** ausrichten (gegen Off-Center-Objekte).
     """
     file = spec["file"]
-    size = spec.get("size", 64)
+    size = round(spec.get("size", 64) * scale)
+
+    cached = (atlas_lookup("collectible", file, size=size, mask=spec.get("mask"))
+              or disk_cache_get("collectible", file, size=size, mask=spec.get("mask")))
+    if cached is not None:
+        return cached
 
     # Laden (roh, ohne Alpha-Konvertierung, damit set_colorkey wirken kann)
     path = os.path.join(os.path.dirname(__file__), file)
@@ -122,14 +485,14 @@ def load_collectible_surface_from_spec(spec: dict) -> pygame.Surface:
 
     if mask_mode == "autokey":
         if not surf.get_masks()[3]:
-            surf = surf.convert()
+            surf = _to_display(surf)
         bg = surf.get_at((0, 0))
         surf.set_colorkey(bg)
-        surf = surf.convert_alpha()
+        surf = _to_alpha(surf)
 
     elif mask_mode == "circle":
         # Normale Kreisfreistellung um die Bildmitte
-        surf = surf.convert_alpha()
+        surf = _to_alpha(surf)
         w, h = surf.get_size()
         d = min(w, h)
         x0 = (w - d) // 2
@@ -144,10 +507,10 @@ def load_collectible_surface_from_spec(spec: dict) -> pygame.Surface:
     elif mask_mode == "circle_smart":
         # 1) Autokey anwenden, damit Hintergrund transparent wird
         if not surf.get_masks()[3]:
-            surf = surf.convert()
+            surf = _to_display(surf)
         bg = surf.get_at((0, 0))
         surf.set_colorkey(bg)
-        surf = surf.convert_alpha()
+        surf = _to_alpha(surf)
         # 2) Inhaltsmaske bestimmen und Bounding-Box holen
         try:
             m = pygame.mask.from_surface(surf)
@@ -188,29 +551,92 @@ def load_collectible_surface_from_spec(spec: dict) -> pygame.Surface:
                 surf = square
         except Exception:
             # Fallback bei Problemen
-            surf = surf.convert_alpha()
+            surf = _to_alpha(surf)
 
     else:
         # Kein spezieller Modus → nur Alpha sicherstellen
-        surf = surf.convert_alpha()
+        surf = _to_alpha(surf)
 
     # Endgröße setzen
     surf = pygame.transform.smoothscale(surf, (size, size))
-    return surf
+    return disk_cache_put("collectible", file, surf, size=size, mask=mask_mode)
+
+# --- Vorgerenderte Rotationsstufen für den Vogel ---
+ROTATION_STEP = 1.0        # Grad pro Stufe (größer = weniger Speicher, gröbere Drehung)
+BIRD_ROT_MIN, BIRD_ROT_MAX = -25, 60
+WING_BOOST = 18.0          # Zusatzwinkel beim Flap (Grad)
+
+
+def wing_shadow(img: pygame.Surface) -> pygame.Surface:
+    shadow = img.copy()
+    shadow.fill((0, 0, 0, 70), None, pygame.BLEND_RGBA_MULT)
+    return shadow
+
+
+class BirdFrames:
+    """Tabelle vorgedrehter Bilder: Gesicht pro Rotationsstufe, Flügel + Schatten pro Flügelwinkel."""
+
+    def __init__(self, step=ROTATION_STEP):
+        self.step = step
+        self.body = {}
+        self.masks = {}     # Kollisionsmaske pro Rotationsstufe (gleiche Indizes wie body)
+        self.wings = {}
+
+    def _index(self, angle):
+        return int(round(angle / self.step))
+
+    def _indices(self, lo, hi):
+        return range(int(math.floor(lo / self.step)), int(math.ceil(hi / self.step)) + 1)
+
+    def build_body(self, face: pygame.Surface, lo=BIRD_ROT_MIN, hi=BIRD_ROT_MAX):
+        self.body = {}
+        self.masks = {}
+        for i in self._indices(lo, hi):
+            angle = -i * self.step
+            # Rezept: im anderen Maßstab das dort neu gebackene Gesicht drehen
+            self.body[i] = set_recipe(pygame.transform.rotozoom(face, angle, 1.0),
+                                      lambda view, a=angle: pygame.transform.rotozoom(view.surf(face), a, 1.0))
+            self.masks[i] = pygame.mask.from_surface(self.body[i])
+
+    def build_wings(self, left: pygame.Surface, right: pygame.Surface, lo, hi):
+        self.wings = {}
+        for i in self._indices(lo, hi):
+            angle = i * self.step
+            left_rot = set_recipe(pygame.transform.rotozoom(left, angle, 1.0),
+                                  lambda view, a=angle: pygame.transform.rotozoom(view.surf(left), a, 1.0))
+            right_rot = set_recipe(pygame.transform.rotozoom(right, -angle, 1.0),
+                                   lambda view, a=-angle: pygame.transform.rotozoom(view.surf(right), a, 1.0))
+            shadows = [set_recipe(wing_shadow(img), lambda view, img=img: wing_shadow(view.surf(img)))
+                       for img in (left_rot, right_rot)]
+            self.wings[i] = (left_rot, right_rot, shadows[0], shadows[1])
+
+    def _lookup(self, table, angle):
+        i = self._index(angle)
+        frame = table.get(i)
+        if frame is None:
+            i = max(min(table), min(max(table), i))
+            frame = table[i]
+        return frame
+
+    def body_frame(self, rotation):
+        return self._lookup(self.body, rotation)
+
+    def body_mask(self, rotation):
+        return self._lookup(self.masks, rotation)
+
+    def wing_frames(self, angle):
+        """(links, rechts, schatten_links, schatten_rechts) für den Flügelwinkel."""
+        return self._lookup(self.wings, angle)
+
 
 class Bird(pygame.sprite.Sprite):
-    def __init__(self, x, y, face_surface: pygame.Surface):
+    def __init__(self, x, y, face_surface: pygame.Surface, wings=None):
         super().__init__()
-        # Basisbild aus der Charakterwahl
-        self.base_image = face_surface
-        # Neue Flügelbilder laden
-        self.left_wing_image = load_image_local("LinkerFluegel.png")
-        self.right_wing_image = load_image_local("RechterFluegel.png")
+        # Neue Flügelbilder laden (oder übergebene, z. B. Platzhalter ohne Display)
         # Etwas kleiner skalieren für bessere Proportionen
-        self.left_wing_image = pygame.transform.smoothscale(self.left_wing_image, (48, 48))
-        self.right_wing_image = pygame.transform.smoothscale(self.right_wing_image, (48, 48))
-        self.image = self.base_image.copy()
-        self.rect = self.image.get_rect(center=(x, y))
+        if wings is None:
+            wings = (load_scaled_image(WING_FILES[0], WING_SIZE), load_scaled_image(WING_FILES[1], WING_SIZE))
+        self.left_wing_image, self.right_wing_image = wings
         self.vel = 0.0
         self.rotation = 0.0
         self.alive = True
@@ -223,22 +649,68 @@ class Bird(pygame.sprite.Sprite):
         self.wing_base_amp = 10              # Grund-Amplitude (Grad)
         self.wing_boost_dur = 0.15           # Dauer des Flap-Boosts
 
+        # Flügelwinkel liegt immer in [-amp - boost, amp] → einmal vorrendern
+        self.frames = BirdFrames()
+        self.frames.build_wings(self.left_wing_image, self.right_wing_image,
+                                -self.wing_base_amp - WING_BOOST, self.wing_base_amp)
+        # Mittelpunkt als Float (Rect ist nur die gerundete Sicht darauf)
+        self.x, self.y = float(x), float(y)
+        self.prev_y = self.y
+        self.set_face(face_surface)
+
+    def set_face(self, face_surface: pygame.Surface):
+        """Neuen Charakter setzen und dessen Rotationsstufen vorrendern."""
+        # Basisbild aus der Charakterwahl
+        self.base_image = face_surface
+        self.frames.build_body(face_surface)
+        self._set_frame()
+        self._sync_rect()
+
+    def _set_frame(self):
+        """Vorgedrehtes Bild und passende Kollisionsmaske zur aktuellen Rotation."""
+        self.image = self.frames.body_frame(self.rotation)
+        self.mask = self.frames.body_mask(self.rotation)
+
+    def _sync_rect(self):
+        self.rect = self.image.get_rect(center=(round(self.x), round(self.y)))
+
+    def place_bottom(self, bottom):
+        """Unterkante exakt auf bottom setzen (Boden)."""
+        h = self.image.get_height()
+        self.y = float(bottom - h + h // 2)
+        self._sync_rect()
+
+    def reset(self, x, y):
+        """Zurück auf Startposition und -zustand (für einen neuen Lauf)."""
+        self.vel = 0.0
+        self.rotation = 0.0
+        self.alive = True
+        self.wing_phase = 0.0
+        self.wing_flap_time = 0.0
+        self._set_frame()
+        self.x, self.y = float(x), float(y)
+        self.prev_y = self.y
+        self._sync_rect()
+
     def flap(self):
         self.vel = -8.5
         self.wing_flap_time = self.wing_boost_dur
 
-    def draw_wings(self, surface):
+    def draw_wings(self, surface, center=None):
         """Zeichnet die Flügelbilder (links/rechts) mit sanfter Animation, sodass das Gesicht sichtbar bleibt."""
-        cx, cy = self.rect.center
+        surface.blits(self.wing_items(center))
+
+    def wing_items(self, center=None):
+        """(Bild, Rect)-Paare für Schatten und Flügel, in Zeichenreihenfolge."""
+        cx, cy = center if center is not None else self.rect.center
 
         # Sanftes Dauerwippen + Flap-Boost
         base = self.wing_base_amp * math.sin(self.wing_phase * math.tau)
-        boost = 18.0 * (self.wing_flap_time / self.wing_boost_dur) if self.wing_flap_time > 0 else 0.0
+        boost = WING_BOOST * (self.wing_flap_time / self.wing_boost_dur) if self.wing_flap_time > 0 else 0.0
         angle = base - boost
 
-        # Rotation auf separate Kopien anwenden
-        left_rot = pygame.transform.rotozoom(self.left_wing_image, angle, 1.0)
-        right_rot = pygame.transform.rotozoom(self.right_wing_image, -angle, 1.0)
+        # Vorgedrehte Flügel + Schatten aus der Tabelle
+        left_rot, right_rot, left_shadow, right_shadow = self.frames.wing_frames(angle)
 
         # Positionierung leicht hinter dem Kopf, damit der Avatar sichtbar bleibt
         offset_x = 54
@@ -246,34 +718,32 @@ class Bird(pygame.sprite.Sprite):
         left_rect = left_rot.get_rect(center=(cx - offset_x, cy + offset_y))
         right_rect = right_rot.get_rect(center=(cx + offset_x, cy + offset_y))
 
-        # Flügel-Schatten für bessere Sichtbarkeit
-        for img, rect in ((left_rot, left_rect), (right_rot, right_rect)):
-            shadow = img.copy()
-            shadow.fill((0, 0, 0, 70), None, pygame.BLEND_RGBA_MULT)
-            surface.blit(shadow, rect.move(2, 2))
-
-        # Flügel selbst zeichnen (links und rechts)
-        surface.blit(left_rot, left_rect)
-        surface.blit(right_rot, right_rect)
+        # Flügel-Schatten für bessere Sichtbarkeit (fällt auf niedrigen Qualitätsstufen weg),
+        # dann die Flügel selbst (links und rechts)
+        wings = [(left_rot, left_rect), (right_rot, right_rect)]
+        if not QUALITY["wing_shadows"]:
+            return wings
+        return [(left_shadow, left_rect.move(2, 2)), (right_shadow, right_rect.move(2, 2))] + wings
 
     def update(self, dt):
-        # Physik
+        # Physik (vel in Pixel pro Sim-Schritt bei SIM_HZ)
+        self.prev_y = self.y
         self.vel += 20.0 * dt   # Gravitation
-        self.rect.y += int(self.vel)
+        self.y += self.vel * dt * SIM_HZ
 
         # Flügelphase fortschreiben (0..1) für sanftes Dauerwippen
         self.wing_phase = (self.wing_phase + dt * self.wing_speed) % 1.0
 
         # Rotation abhängig von Geschwindigkeit
-        self.rotation = max(-25, min(60, self.vel * 3.5))
-        # Bild rotieren und Mittelpunkt behalten
-        center_before = self.rect.center
-        self.image = pygame.transform.rotozoom(self.base_image, -self.rotation, 1.0)
-        self.rect = self.image.get_rect(center=center_before)
+        self.rotation = max(BIRD_ROT_MIN, min(BIRD_ROT_MAX, self.vel * 3.5))
+        # Vorgedrehtes Bild holen und Mittelpunkt behalten
+        self._set_frame()
+        self._sync_rect()
 
         # Kopfbegrenzung
         if self.rect.top < 0:
-            self.rect.top = 0
+            self.y = float(self.image.get_height() // 2)
+            self._sync_rect()
             self.vel = 0
 
         # Flügel-Boost abbauen
@@ -282,155 +752,1753 @@ class Bird(pygame.sprite.Sprite):
             if self.wing_flap_time < 0:
                 self.wing_flap_time = 0
 
-    def render(self, screen):
+    def draw_items(self, alpha=1.0):
+        """Display-Liste zwischen letztem und aktuellem Sim-Zustand interpoliert (alpha 0..1)."""
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        center = (round(self.x), round(y))
         # Flügel zuerst zeichnen (hinter dem Vogel)
-        self.draw_wings(screen)
-        screen.blit(self.image, self.rect)
+        items = self.wing_items(center)
+        items.append((self.image, self.image.get_rect(center=center)))
+        return items
 
+    def render(self, screen, alpha=1.0):
+        screen.blits(self.draw_items(alpha))
 
 
-class Pipe(pygame.sprite.Sprite):
+
+# --- Objekt-Pools (Sprites recyceln statt neu anlegen) ---
+class SpritePool:
+    """Hält freigegebene Sprites einer Klasse vor: acquire() statt Konstruktor, release() statt kill().
+    Die Klasse braucht eine reset(...)-Methode mit denselben Argumenten wie __init__.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        obj.pool = self
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj):
+        obj.kill()
+        if obj.pool is self:
+            obj.pool = None
+            self.in_use -= 1
+            self.free.append(obj)
+
+    def stats(self) -> dict:
+        return {"in_use": self.in_use, "free": len(self.free),
+                "high_water": self.high_water, "created": self.created}
+
+
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None
+
+    def release(self):
+        """Zurück in den Pool (oder einfach entfernen, wenn ohne Pool erzeugt)."""
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self.kill()
+
+
+class Scroller(PooledSprite):
+    """Scrollt mit SPEED nach links. Float-Position x, prev_x für interpoliertes Zeichnen."""
     SPEED = 180  # px/s
+    SELF_CULL = True  # links aus dem Bild → selbst freigeben (False: der Besitzer räumt auf)
+
+    def place(self, rect):
+        self.rect = rect
+        self.x = self.prev_x = float(rect.x)
+
+    def update(self, dt):
+        self.prev_x = self.x
+        self.x -= self.SPEED * dt
+        self.rect.x = round(self.x)
+        if self.SELF_CULL and self.rect.right < -5:
+            self.release()
+
+    def draw_rect(self, alpha=1.0):
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return self.rect.move(round(x) - self.rect.x, 0)
+
+
+def release_all(group):
+    for s in group.sprites():
+        s.release()
+
+
+def pool_report(pools: dict) -> str:
+    return ", ".join(f"{name}: max {p.high_water} aktiv / {p.created} erzeugt" for name, p in pools.items())
+
+
+class SweepGroup(pygame.sprite.Group):
+    """Gruppe von Scrollern, nach x sortiert (Sweep-Liste für Broad-Phase und Culling).
+    Alle scrollen gleich schnell nach links, die Reihenfolge ändert sich also nie: jeder Sprite bekommt
+    beim Einfügen den festen Schlüssel x + scroll, advance(dt) schiebt nur scroll weiter und
+    query(x0, x1) findet die Kandidaten per bisect statt alle Sprites anzufassen.
+    """
+
+    def __init__(self, *sprites):
+        self.keys = []
+        self.order = []
+        self.key_of = {}
+        self.scroll = 0.0
+        self.max_w = 0
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        key = self.key_of[sprite] = sprite.x + self.scroll
+        i = bisect.bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.order.insert(i, sprite)
+        self.max_w = max(self.max_w, sprite.rect.width)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        i = bisect.bisect_left(self.keys, self.key_of.pop(sprite))
+        while self.order[i] is not sprite:
+            i += 1
+        del self.keys[i]
+        del self.order[i]
+
+    def advance(self, dt):
+        """Nach dem Update aller Mitglieder aufrufen (gleiche Strecke wie Scroller.update)."""
+        self.scroll += Scroller.SPEED * dt
+
+    def query(self, x0, x1):
+        """Sprites, deren Rect den x-Bereich [x0, x1] berühren kann, nach x sortiert (y ungeprüft)."""
+        lo = bisect.bisect_left(self.keys, x0 + self.scroll - self.max_w - 1)
+        hi = bisect.bisect_right(self.keys, x1 + self.scroll + 1)
+        return self.order[lo:hi]
+
+
+# Kollisionsmasken geteilter Bilder (Säulen pro Größe, Collectibles pro Spec), nur einmal berechnen.
+# Schlüssel ist die Surface-Identität; die Surface wird mitgehalten, damit die id nicht neu vergeben wird.
+_MASKS = {}
+
+
+def get_mask(surface: pygame.Surface) -> pygame.mask.Mask:
+    entry = _MASKS.get(id(surface))
+    if entry is None:
+        entry = _MASKS[id(surface)] = (surface, pygame.mask.from_surface(surface))
+    return entry[1]
+
+
+# Säulenbilder hängen nur von Höhe + Ausrichtung ab → einmal pro Größe rendern und teilen
+_PIPE_SURFACES = {}
+
+
+def get_pipe_surface(width, height, flipped) -> pygame.Surface:
+    key = (width, height, flipped)
+    surf = _PIPE_SURFACES.get(key)
+    if surf is None:
+        color = (30, 200, 90) if not flipped else (30, 160, 70)
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        surf.fill(color)
+        pygame.draw.rect(surf, (10, 120, 50), (0, 0, width, height), 6)
+        if flipped:
+            surf = pygame.transform.flip(surf, False, True)
+        _PIPE_SURFACES[key] = set_recipe(surf, lambda view: get_pipe_surface(
+            round(width * view.scale), round(height * view.scale), flipped))
+    return surf
+
+
+class Pipe(Scroller):
+    SELF_CULL = False  # PipeQueue entfernt Säulen paarweise am Kopf
 
     def __init__(self, x, height, flipped=False):
         super().__init__()
         self.width = 60
+        self.reset(x, height, flipped)
+
+    def reset(self, x, height, flipped=False):
         self.color = (30, 200, 90) if not flipped else (30, 160, 70)
-        surface_height = height
-        surf = pygame.Surface((self.width, surface_height), pygame.SRCALPHA)
-        surf.fill(self.color)
-        pygame.draw.rect(surf, (10, 120, 50), (0, 0, self.width, surface_height), 6)
-        self.image = surf
-        self.rect = self.image.get_rect(midtop=(x, 0))
+        self.image = get_pipe_surface(self.width, height, flipped)
+        self.mask = get_mask(self.image)
         if flipped:
-            self.image = pygame.transform.flip(self.image, False, True)
-            self.rect = self.image.get_rect(midbottom=(x, HEIGHT - 120))  # 120 = Bodenhöhe
+            self.place(self.image.get_rect(midbottom=(x, HEIGHT - 120)))  # 120 = Bodenhöhe
+        else:
+            self.place(self.image.get_rect(midtop=(x, 0)))
 
         self.flipped = flipped
 
-    def update(self, dt):
-        self.rect.x -= int(self.SPEED * dt)
-        if self.rect.right < -5:
-            self.kill()
+
+# --- Collectible-Sprite-Cache (Bild + Halo fertig komponiert) ---
+_COLLECTIBLE_SPRITES = {}
+
+
+_COLLECTIBLE_BARE = {}
+COLLECTIBLE_HALO_PAD = 10
+
+
+@rebakeable
+def make_collectible_sprite(spec: dict, scale=1.0) -> pygame.Surface:
+    """Collectible-Bild mit Sichtbarkeits-Halo (weicher weißer Schein hinter dem Item)."""
+    pad = round(COLLECTIBLE_HALO_PAD * scale)
+    params = dict(size=round(spec.get("size", 64) * scale), mask=spec.get("mask"), halo=pad)
+    cached = disk_cache_get("sprite", spec["file"], **params)
+    if cached is not None:
+        return cached
+    base = load_collectible_surface_from_spec(spec, scale=scale)
+    w, h = base.get_size()
+    halo = pygame.Surface((w + pad*2, h + pad*2), pygame.SRCALPHA)
+    cx, cy = halo.get_width() // 2, halo.get_height() // 2
+    rad = int(max(w, h) / 2)
+    for dr, alpha in [(8, 30), (5, 60), (2, 90)]:
+        pygame.draw.circle(halo, (255, 255, 255, alpha), (cx, cy), rad + round(dr * scale))
+    halo.blit(base, (pad, pad))
+    return disk_cache_put("sprite", spec["file"], halo, **params)
+
+
+def get_collectible_sprite(spec: dict) -> pygame.Surface:
+    """Fertiges Sprite aus dem Cache; Schlüssel ist der Spec-Inhalt (geänderte Spec = neuer Eintrag)."""
+    key = spec_key(spec)
+    surf = _COLLECTIBLE_SPRITES.get(key)
+    if surf is None:
+        surf = _COLLECTIBLE_SPRITES[key] = make_collectible_sprite(spec)
+    return surf
+
+
+def get_collectible_mask(spec: dict) -> pygame.mask.Mask:
+    """Kollisionsmaske aus dem echten Sprite (Halo ist durchscheinend → zählt nicht). Gilt auch für
+    headless World und batch_sim, damit Replays ohne Fenster genauso ausgehen wie im Spiel."""
+    return get_mask(get_collectible_sprite(spec))
+
+
+def get_collectible_bare(spec: dict) -> pygame.Surface:
+    """Collectible ohne Halo (niedrige Qualitätsstufen); kleinerer Alpha-Blit, gleiche Mitte."""
+    key = spec_key(spec)
+    surf = _COLLECTIBLE_BARE.get(key)
+    if surf is None:
+        surf = _COLLECTIBLE_BARE[key] = load_collectible_surface_from_spec(spec)
+    return surf
+
+
+def warm_collectible_cache(specs=None, assets=None):
+    """Alle Collectibles vorab laden, damit ein Spawn im Spiel nur ein Dict-Lookup ist – auch die
+    Varianten ohne Halo, sonst lädt der erste Stufenwechsel sie mitten in einem ohnehin langsamen Frame."""
+    for spec in (COLLECTIBLES if specs is None else specs):
+        if assets is not None:
+            _COLLECTIBLE_SPRITES.setdefault(spec_key(spec), assets.get(collectible_asset(spec)))
+        get_collectible_sprite(spec)
+        get_collectible_bare(spec)
 
 
 # --- Collectible-Klasse ---
-class Collectible(pygame.sprite.Sprite):
-    def __init__(self, spec: dict, x: int, y: int):
+class Collectible(Scroller):
+    def __init__(self, spec: dict, x: int, y: int, image=None):
         super().__init__()
+        self.reset(spec, x, y, image)
+
+    def reset(self, spec: dict, x: int, y: int, image=None):
         self.spec = spec
-        base = load_collectible_surface_from_spec(spec)
-        # Sichtbarkeits-Halo: weicher weißer Schein hinter dem Item
-        pad = 10
-        w, h = base.get_size()
-        halo = pygame.Surface((w + pad*2, h + pad*2), pygame.SRCALPHA)
-        cx, cy = halo.get_width() // 2, halo.get_height() // 2
-        rad = int(max(w, h) / 2)
-        for dr, alpha in [(8, 30), (5, 60), (2, 90)]:
-            pygame.draw.circle(halo, (255, 255, 255, alpha), (cx, cy), rad + dr)
-        halo.blit(base, (pad, pad))
-        self.image = halo
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = image if image is not None else get_collectible_sprite(spec)
+        self.mask = get_collectible_mask(spec)   # auch mit Platzhalterbild die echte Form
+        self.place(self.image.get_rect(center=(x, y)))
         self.points = spec["points"]
         self.pop_color = spec.get("color", (255, 255, 255))
+        self.placeholder = image is not None
+
+    def bare_item(self, rect):
+        """(Bild ohne Halo, Rect) für niedrige Qualitätsstufen; Platzhalter haben keinen Halo."""
+        bare = self.image if self.placeholder else get_collectible_bare(self.spec)
+        return bare, bare.get_rect(center=rect.center)
+
+# --- Schriften + Text-Cache ---
+# SysFont sucht bei jedem Aufruf die Systemschrift → jede Schrift nur einmal pro Prozess laden.
+# Gerenderte Texte landen in einem LRU-Cache; die Surfaces sind geteilt und dürfen nicht verändert
+# werden (für Alpha-Ausblendungen einmal .copy() anlegen).
+TEXT_CACHE_SIZE = 256
+_FONTS = {}
+_FONT_KEYS = {}     # Schrift → (name, size, bold), für Rezepte in anderem Maßstab
+_TEXT_CACHE = OrderedDict()
+_TEXT_STATS = {"hits": 0, "misses": 0}
+
+
+def get_font(size, name="arial", bold=False):
+    """Gemeinsame Schrift; name=None → pygame-Standardschrift."""
+    key = (name, size, bold)
+    font = _FONTS.get(key)
+    if font is None:
+        font = _FONTS[key] = (pygame.font.Font(None, size) if name is None
+                              else pygame.font.SysFont(name, size, bold=bold))
+        _FONT_KEYS[font] = key
+    return font
+
+
+def scaled_font(font, scale):
+    """Dieselbe Schrift in scale-facher Größe (nur für Schriften aus get_font)."""
+    name, size, bold = _FONT_KEYS[font]
+    return get_font(max(1, round(size * scale)), name, bold)
+
+
+def render_text(font, text, color, antialias=True):
+    """font.render() mit LRU-Cache über (Schrift, Text, Farbe)."""
+    key = (font, text, tuple(color), antialias)
+    surf = _TEXT_CACHE.get(key)
+    if surf is not None:
+        _TEXT_CACHE.move_to_end(key)
+        _TEXT_STATS["hits"] += 1
+        return surf
+    _TEXT_STATS["misses"] += 1
+    surf = _TEXT_CACHE[key] = font.render(text, antialias, color)
+    if font in _FONT_KEYS:
+        # In anderem Maßstab mit größerer Schrift neu rendern (scharf statt hochskaliert); eigene Kopie,
+        # weil die View die Transparenz der Quelle auf das Ergebnis überträgt
+        set_recipe(surf, lambda view: render_text(scaled_font(font, view.scale), text, color, antialias).copy())
+    if len(_TEXT_CACHE) > TEXT_CACHE_SIZE:
+        _TEXT_CACHE.popitem(last=False)
+    return surf
+
+
+def text_copy(font, text, color, antialias=True):
+    """Eigene Kopie eines gecachten Texts (für set_alpha), mit demselben Rezept."""
+    surf = render_text(font, text, color, antialias)
+    return copy_recipe(surf, surf.copy())
+
+
+def text_cache_report():
+    return f"{len(_TEXT_CACHE)} Texte, {_TEXT_STATS['hits']} Treffer / {_TEXT_STATS['misses']} gerendert"
 
-    def update(self, dt):
-        self.rect.x -= int(Pipe.SPEED * dt)
-        if self.rect.right < -5:
-            self.kill()
 
 # --- ScorePopup-Klasse ---
-class ScorePopup(pygame.sprite.Sprite):
+class ScorePopup(PooledSprite):
     def __init__(self, x, y, text="+5", color=(255, 255, 255)):
         super().__init__()
+        self.font = get_font(28, bold=True)
+        self.reset(x, y, text, color)
+
+    def reset(self, x, y, text="+5", color=(255, 255, 255)):
         self.text = text
         self.color = color
         self.t = 0.0
         self.duration = 0.7  # Sekunden
         self.vy = -40        # Pixel/Sekunde nach oben
-        # Eigenen Font anlegen (unabhängig vom globalen)
-        self.font = pygame.font.SysFont("arial", 28, bold=True)
-        self.image = self.font.render(self.text, True, self.color)
+        # Eigene Kopie, weil set_alpha() das Bild verändert (Cache-Surface bleibt unberührt)
+        self.image = text_copy(self.font, self.text, self.color)
         self.rect = self.image.get_rect(center=(x, y))
+        self.y = float(self.rect.y)
 
     def update(self, dt):
         self.t += dt
         # Nach oben bewegen
-        self.rect.y += int(self.vy * dt)
-        # Alpha langsam ausblenden
-        alpha = max(0, min(255, int(255 * (1.0 - self.t / self.duration))))
-        # Neu rendern mit Alpha (Surface kopieren, dann Alpha setzen)
-        surf = self.font.render(self.text, True, self.color)
-        surf.set_alpha(alpha)
-        self.image = surf
+        self.y += self.vy * dt
+        self.rect.y = round(self.y)
+        # Alpha langsam ausblenden (gleiche Surface, kein Neu-Rendern)
+        # (auf der niedrigsten Qualitätsstufe ohne Ausblenden: voll sichtbar bis zum Ende)
+        self.image.set_alpha(max(0, min(255, int(255 * (1.0 - self.t / self.duration))))
+                             if QUALITY["fades"] else None)
         if self.t >= self.duration:
-            self.kill()
+            self.release()
 
 
 class Ground(pygame.sprite.Sprite):
     SPEED = 180
 
+    THICKNESS = 120
+
     def __init__(self):
         super().__init__()
-        self.height = 120
-        self.image = pygame.Surface((WIDTH * 2, self.height))
-        self.image.fill((230, 220, 180))
-        for x in range(0, self.image.get_width(), 24):
-            pygame.draw.rect(self.image, (205, 195, 150), (x, 0, 12, self.height))
+        self.height = self.THICKNESS
+        self.image = set_recipe(self.bake(), lambda view: Ground.bake(view.scale))
         self.rect = self.image.get_rect(bottomleft=(0, HEIGHT))
+        self.x = 0.0
+
+    @classmethod
+    def bake(cls, scale=1.0):
+        # Streifen an logischen Positionen runden → gleiches Muster in jedem Maßstab (nahtloser Umlauf)
+        image = pygame.Surface((round(WIDTH * 2 * scale), round(cls.THICKNESS * scale)))
+        image.fill((230, 220, 180))
+        for x in range(0, WIDTH * 2, 24):
+            pygame.draw.rect(image, (205, 195, 150), (round(x * scale), 0, round(12 * scale), image.get_height()))
+        return image
 
     def update(self, dt):
-        self.rect.x -= int(self.SPEED * dt)
-        if self.rect.right <= WIDTH:
-            self.rect.left = 0
+        self.x -= self.SPEED * dt
+        if self.x + self.rect.width <= WIDTH:
+            self.x = 0.0
+        self.rect.x = round(self.x)
+
+
+# --- Hintergrund (vorgerenderte Parallax-Ebenen) ---
+# Jede Ebene wird einmal pro Auflösung und Maßstab gebacken und pro Frame nur noch geblittet.
+# Builder bekommen die logische Größe und den Maßstab; Zufallspositionen werden logisch gewürfelt und
+# erst beim Zeichnen skaliert, damit jeder Maßstab dasselbe Bild zeigt.
+# kind = Builder aus BACKGROUND_BUILDERS, speed = Scroll-Geschwindigkeit in px/s (0 = statisch)
+BACKGROUND_LAYERS = [
+    {"kind": "gradient", "speed": 0, "top": (45, 160, 230), "bottom": (180, 230, 255)},
+    # Beispiele für zusätzliche Ebenen (kosten zur Laufzeit nur Blits):
+    # {"kind": "clouds",  "speed": 20, "count": 6, "seed": 7},
+    # {"kind": "skyline", "speed": 60, "color": (150, 200, 230), "seed": 3},
+]
 
 
-def draw_background(screen):
-    # einfacher Verlaufshimmel
-    top = pygame.Color(45, 160, 230)
-    bottom = pygame.Color(180, 230, 255)
-    for y in range(HEIGHT - 120):  # bis Boden
-        ratio = y / (HEIGHT - 120)
+def _bake_gradient(spec: dict, size, scale=1.0) -> pygame.Surface:
+    # Eine Spalte zeilenweise füllen und dann auf volle Breite strecken
+    w, h = round(size[0] * scale), round(size[1] * scale)
+    top = pygame.Color(*spec.get("top", (45, 160, 230)))
+    bottom = pygame.Color(*spec.get("bottom", (180, 230, 255)))
+    column = pygame.Surface((1, h))
+    for y in range(h):
+        ratio = y / h
         color = (
             int(top.r + (bottom.r - top.r) * ratio),
             int(top.g + (bottom.g - top.g) * ratio),
             int(top.b + (bottom.b - top.b) * ratio),
         )
-        pygame.draw.line(screen, color, (0, y), (WIDTH, y))
+        column.set_at((0, y), color)
+    return pygame.transform.scale(column, (w, h))
+
+
+def _bake_clouds(spec: dict, size, scale=1.0) -> pygame.Surface:
+    # Weiche Wolken aus überlagerten Ellipsen; horizontal kachelbar
+    w, h = size
+    rng = random.Random(spec.get("seed", 0))
+    surf = pygame.Surface((round(w * scale), round(h * scale)), pygame.SRCALPHA)
+    for _ in range(spec.get("count", 6)):
+        cx = rng.randint(0, w)
+        cy = rng.randint(20, h // 2)
+        cw = rng.randint(60, 120)
+        ch = cw // 3
+        for dx, dy, k in ((0, 0, 1.0), (-cw // 3, ch // 4, 0.7), (cw // 3, ch // 4, 0.7)):
+            r = pygame.Rect(0, 0, round(int(cw * k) * scale), round(int(ch * k * 1.4) * scale))
+            for ox in (-w, 0, w):
+                r.center = (round((cx + dx + ox) * scale), round((cy + dy) * scale))
+                pygame.draw.ellipse(surf, (255, 255, 255, 150), r)
+    return surf
+
+
+def _bake_skyline(spec: dict, size, scale=1.0) -> pygame.Surface:
+    # Einfache Häuserkante am unteren Rand des Himmels
+    w, h = size
+    rng = random.Random(spec.get("seed", 0))
+    color = spec.get("color", (150, 200, 230))
+    surf = pygame.Surface((round(w * scale), round(h * scale)), pygame.SRCALPHA)
+    x = 0
+    while x < w:
+        bw = rng.randint(24, 56)
+        bh = rng.randint(40, 140)
+        left, top = round(x * scale), round((h - bh) * scale)
+        pygame.draw.rect(surf, color, (left, top, round(min(x + bw, w) * scale) - left, surf.get_height() - top))
+        x += bw
+    return surf
+
+
+BACKGROUND_BUILDERS = {
+    "gradient": _bake_gradient,
+    "clouds": _bake_clouds,
+    "skyline": _bake_skyline,
+}
+
+_BACKGROUND_CACHE = {}
+
+
+def bake_background_layer(spec: dict, size, scale=1.0) -> pygame.Surface:
+    """Backt eine Hintergrund-Ebene (einmal pro Spec, Auflösung und Maßstab, danach aus dem Cache)."""
+    key = (spec_key(spec), tuple(size), scale)
+    surf = _BACKGROUND_CACHE.get(key)
+    if surf is None:
+        surf = BACKGROUND_BUILDERS[spec["kind"]](spec, size, scale)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha() if surf.get_flags() & pygame.SRCALPHA else surf.convert()
+        _BACKGROUND_CACHE[key] = surf
+    return surf
+
+
+class Background:
+    """Mehrere vorgerenderte Ebenen, die pro Frame nur noch gescrollt und geblittet werden."""
 
+    def __init__(self, size=(WIDTH, HEIGHT - 120), layers=None, scale=1.0):  # bis Boden
+        self.scale = scale
+        self.size = (round(size[0] * scale), round(size[1] * scale))   # in Fensterpixeln
+        self.layers = []
+        for spec in (BACKGROUND_LAYERS if layers is None else layers):
+            self.layers.append([spec, bake_background_layer(spec, size, scale), 0.0])
 
-def spawn_pipe_pair(group_all, group_pipes, x):
-    gap = random.randint(320, 400)  # noch größerer Abstand = einfacher
-    top_min, top_max = 80, HEIGHT - 120 - gap - 80
-    top_h = random.randint(top_min, top_max)
+    def update(self, dt):
+        for layer in self.layers:
+            speed = layer[0].get("speed", 0)
+            if speed:
+                layer[2] = (layer[2] + speed * self.scale * dt) % self.size[0]
+
+    def is_static(self):
+        """True, wenn keine Ebene scrollt (Voraussetzung für Dirty-Rect-Rendering)."""
+        return not any(spec.get("speed", 0) for spec, _, _ in self.layers)
+
+    def draw(self, screen, origin=(0, 0)):
+        ox, oy = origin
+        for spec, surf, offset in self.layers:
+            x = ox - int(offset)
+            screen.blit(surf, (x, oy))
+            if x != ox:
+                screen.blit(surf, (x + self.size[0], oy))
+
+
+_BACKGROUNDS = {}
+
+
+def get_background(screen_size, scale=1.0) -> Background:
+    """Gemeinsamer Hintergrund pro (logischer) Bildschirmgröße und Maßstab."""
+    key = (tuple(screen_size), scale)
+    bg = _BACKGROUNDS.get(key)
+    if bg is None:
+        w, h = screen_size
+        bg = _BACKGROUNDS[key] = Background((w, h - Ground.THICKNESS), scale=scale)
+    return bg
+
+
+def draw_background(screen):
+    get_background(screen.get_size()).draw(screen)
+
+
+def roll_gap(rng=random, gap_range=(320, 400), margin=80):
+    """Lückengröße und Höhe der oberen Säule würfeln → (gap, top_h)."""
+    gap = rng.randint(*gap_range)  # noch größerer Abstand = einfacher
+    top_h = rng.randint(margin, HEIGHT - 120 - gap - margin)
+    return gap, top_h
+
+
+def spawn_pipe_pair(group_all, group_pipes, x, pool=None, rng=random, segment=None):
+    """Säulenpaar bei x; Maße aus segment (Level-Stream) oder frisch aus rng gewürfelt."""
+    gap, top_h = (segment.gap, segment.top_h) if segment is not None else roll_gap(rng)
     bottom_h = HEIGHT - 120 - gap - top_h
     gap_center_y = top_h + gap // 2
-    top_pipe = Pipe(x, top_h, flipped=False)
-    bottom_pipe = Pipe(x, bottom_h, flipped=True)
+    make_pipe = pool.acquire if pool is not None else Pipe
+    top_pipe = make_pipe(x, top_h, flipped=False)
+    bottom_pipe = make_pipe(x, bottom_h, flipped=True)
     group_all.add(top_pipe, bottom_pipe)
     group_pipes.add(top_pipe, bottom_pipe)
     return (top_pipe, bottom_pipe, gap_center_y)
 
 
-def character_select(screen, clock, font_big, font):
-    """Zeigt die Auswahl für Nizi19/Yuyu19. Gibt Index (0/1) zurück."""
-    # Skins laden & verkleinern
-    skins = []
+class PipePair:
+    __slots__ = ("top", "bottom", "gap_y")
+
+    def __init__(self, top, bottom, gap_y):
+        self.top = top
+        self.bottom = bottom
+        self.gap_y = gap_y
+
+
+class PipeQueue:
+    """Säulenpaare in x-Reihenfolge (sie entstehen rechts und verschwinden links, strikt nacheinander).
+    due() prüft nur das jüngste Paar, score() schiebt einen Cursor am Vogel vorbei, cull() räumt
+    vom Kopf ab – alles O(1) pro Frame statt Schleifen über alle Säulen.
+    """
+
+    def __init__(self, spawn_x=WIDTH + 120):
+        self.spawn_x = spawn_x
+        self.pairs = deque()
+        self.cursor = 0     # erstes Paar, das der Vogel noch nicht passiert hat
+
+    def clear(self):
+        for pair in self.pairs:
+            pair.top.release()
+            pair.bottom.release()
+        self.pairs.clear()
+        self.cursor = 0
+
+    def push(self, top, bottom, gap_y):
+        self.pairs.append(PipePair(top, bottom, gap_y))
+
+    def due(self, spacing):
+        """Neues Paar fällig? (Strecke, die das jüngste Paar seit dem Spawn zurückgelegt hat.)"""
+        return not self.pairs or self.spawn_x - self.pairs[-1].top.x >= spacing
+
+    def cull(self):
+        while self.pairs and self.pairs[0].top.rect.right < -5:
+            pair = self.pairs.popleft()
+            pair.top.release()
+            pair.bottom.release()
+            self.cursor = max(0, self.cursor - 1)
+
+    def score(self, bird_left):
+        """Anzahl der Paare, die seit dem letzten Aufruf ganz links vom Vogel liegen."""
+        passed = 0
+        while self.cursor < len(self.pairs) and self.pairs[self.cursor].top.rect.right < bird_left:
+            self.cursor += 1
+            passed += 1
+        return passed
+
+    def upcoming(self, n=1):
+        """Die nächsten n Paare vor dem Vogel (Stand des letzten score())."""
+        return [self.pairs[i] for i in range(self.cursor, min(self.cursor + n, len(self.pairs)))]
+
+
+# --- Feste Zeitschritte ---
+class FixedStep:
+    """Akkumulator: wandelt beliebige Frame-Zeiten in feste Sim-Schritte um.
+    advance(frame_dt) → Anzahl Schritte; alpha = Anteil bis zum nächsten Schritt (für Interpolation).
+    """
+
+    def __init__(self, step=SIM_DT, max_frame_dt=MAX_FRAME_DT, max_steps=MAX_SIM_STEPS):
+        self.step = step
+        self.max_frame_dt = max_frame_dt
+        self.max_steps = max_steps
+        self.reset()
+
+    def reset(self):
+        self.acc = 0.0
+        self.alpha = 1.0
+
+    def borrow(self):
+        """Einen Schritt vorziehen (Low-Latency-Flap): die Zeit wird vom nächsten Frame abgezogen,
+        so bleibt die Sim-Rate im Mittel exakt. Höchstens ein Schritt Vorschuss.
+        """
+        if self.acc < 0:
+            return 0
+        self.acc -= self.step
+        return 1
+
+    def advance(self, frame_dt):
+        self.acc += min(frame_dt, self.max_frame_dt)
+        steps = int(self.acc / self.step)
+        if steps > self.max_steps:
+            # Aufholen begrenzen, Rest verwerfen statt Spirale des Todes
+            steps = self.max_steps
+            self.acc = 0.0
+        else:
+            self.acc -= steps * self.step
+        self.alpha = self.acc / self.step
+        return steps
+
+
+# --- Zufall pro Teilsystem ---
+class RngStreams:
+    """Ein Seed → getrennte, reproduzierbare Zufallsströme pro Teilsystem.
+    Zusätzliche Ziehungen in einem Teilsystem verschieben so nie die Folge eines anderen.
+    """
+    NAMES = ("pipes", "collectibles")
+
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        self.value = seed
+        for name in self.NAMES:
+            setattr(self, name, random.Random(f"{seed}/{name}"))
+
+
+# --- Level-Stream (Säulen + Collectibles vorab aus dem Seed) ---
+LEVEL_CHUNK = {
+    "pairs": 8,                         # Säulenpaare pro Chunk
+    "gap": (320, 400),                  # Lückengröße min/max
+    "margin": 80,                       # Mindesthöhe oben/unten
+    "spacing": 320,                     # Abstand bis zum nächsten Paar (px Scrollweg)
+    "collectible_every": COLLECTIBLE_EVERY,
+    "collectible_prob": COLLECTIBLE_PROB,
+}
+LEVEL_LOOKAHEAD = 3   # so viele Chunks liegen immer fertig bereit
+
+
+class LevelSegment:
+    """Ein Säulenpaar des Levels: Lücke, Höhe oben, Abstand zum nächsten Paar, Collectible-Spec oder None."""
+    __slots__ = ("index", "gap", "top_h", "spacing", "item")
+
+    def __init__(self, index, gap, top_h, spacing, item=None):
+        self.index = index
+        self.gap = gap
+        self.top_h = top_h
+        self.spacing = spacing
+        self.item = item
+
+    @property
+    def gap_y(self):
+        return self.top_h + self.gap // 2
+
+
+def level_chunks(seed, params=None):
+    """Unendlicher Generator: liefert pro next() einen Chunk (Liste von LevelSegment).
+    Gleicher Seed → gleicher Kurs, egal wann und wo er erzeugt wird.
+    """
+    params = dict(LEVEL_CHUNK, **(params or {}))
+    rng = RngStreams(seed)
+    index = 0
+    while True:
+        chunk = []
+        for _ in range(params["pairs"]):
+            gap, top_h = roll_gap(rng.pipes, params["gap"], params["margin"])
+            index += 1
+            item = None
+            if index % params["collectible_every"] == 0 and rng.collectibles.random() < params["collectible_prob"]:
+                item = weighted_choice(COLLECTIBLES, rng=rng.collectibles)
+            chunk.append(LevelSegment(index, gap, top_h, params["spacing"], item))
+        yield chunk
+
+
+def daily_seed(day=None):
+    """Seed des Tageskurses (UTC-Datum als JJJJMMTT), für alle Spieler und Bots gleich."""
+    return int(day.replace("-", "") if day else time.strftime("%Y%m%d", time.gmtime()))
+
+
+SEED_MASK = 2**64 - 1   # Seeds passen ins Replay-Feld (uint64); andere werden darauf abgebildet
+
+
+class LevelStream:
+    """Liest Segmente aus level_chunks(seed) und hält immer LEVEL_LOOKAHEAD Chunks im Voraus.
+    peek(i) schaut i Segmente nach vorn (ohne zu verbrauchen), next() holt das nächste.
+    """
+
+    def __init__(self, seed=None, params=None, lookahead=LEVEL_LOOKAHEAD):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        seed &= SEED_MASK   # z. B. -5 → gleicher Kurs wie 2**64 - 5, und das Replay lässt sich speichern
+        self.seed = seed
+        self.params = params
+        self.lookahead = lookahead
+        self.chunks = level_chunks(seed, params)
+        self.ahead = deque()
+        self.chunk_size = 0
+        self._fill()
+
+    def _fill(self, need=0):
+        while len(self.ahead) < max(need + 1, self.chunk_size * self.lookahead):
+            chunk = next(self.chunks)
+            self.chunk_size = len(chunk)
+            self.ahead.extend(chunk)
+
+    def peek(self, i=0) -> LevelSegment:
+        if i >= len(self.ahead):
+            self._fill(i)
+        return self.ahead[i]
+
+    def next(self) -> LevelSegment:
+        segment = self.ahead.popleft()
+        self._fill()
+        return segment
+
+
+# --- Frame-Profiler (F3 = Overlay an/aus, F4 = CSV-Export) ---
+class FrameProfiler:
+    """Misst pro Frame die Zeit je Phase (Rundenzeit-Prinzip: lap(name) bucht die Zeit seit dem
+    letzten lap) in einen Ringpuffer. Ausgeschaltet kostet jeder Aufruf nur eine if-Abfrage.
+    """
+
+    def __init__(self, size=240, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.phases = []            # Reihenfolge des ersten Auftretens
+        self.data = {}              # phase → [ms] * size
+        self.totals = [0.0] * size
+        self.counts = {}
+        self.idx = 0
+        self.filled = 0
+        self._t = 0.0
+        self._frame_start = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.idx = self.filled = 0
+        for buf in self.data.values():
+            buf[:] = [0.0] * self.size
+        self._t = self._frame_start = time.perf_counter()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._t = self._frame_start = time.perf_counter()
+        for buf in self.data.values():
+            buf[self.idx] = 0.0
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        buf = self.data.get(phase)
+        if buf is None:
+            buf = self.data[phase] = [0.0] * self.size
+            self.phases.append(phase)
+        buf[self.idx] += (now - self._t) * 1000.0
+        self._t = now
+
+    def end_frame(self, **counts):
+        """Frame abschließen; counts = Entity-Anzahlen für die Anzeige."""
+        if not self.enabled:
+            return
+        self.totals[self.idx] = (time.perf_counter() - self._frame_start) * 1000.0
+        self.counts = counts
+        self.idx = (self.idx + 1) % self.size
+        self.filled = min(self.filled + 1, self.size)
+
+    def _recent(self, buf):
+        if self.filled < self.size:
+            return buf[:self.filled]
+        return buf[self.idx:] + buf[:self.idx]   # älteste zuerst
+
+    def stats(self) -> dict:
+        """Mittelwerte je Phase + Gesamtzeit mit p95/p99 (alles in ms)."""
+        n = self.filled
+        if not n:
+            return {}
+        totals = sorted(self._recent(self.totals))
+        out = {"frame_avg": sum(totals) / n,
+               "frame_p95": totals[min(n - 1, int(n * 0.95))],
+               "frame_p99": totals[min(n - 1, int(n * 0.99))]}
+        for phase in self.phases:
+            out[phase] = sum(self._recent(self.data[phase])) / n
+        return out
+
+    def export_csv(self, path=None) -> str:
+        if path is None:
+            path = time.strftime("profile_%Y%m%d_%H%M%S.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(",".join(["frame_ms"] + self.phases) + "\n")
+            cols = [self._recent(self.totals)] + [self._recent(self.data[p]) for p in self.phases]
+            for row in zip(*cols):
+                f.write(",".join(f"{v:.3f}" for v in row) + "\n")
+        dbg("Profil gespeichert:", path)
+        return path
+
+    def draw_overlay(self, screen, font):
+        if not self.enabled or not self.filled:
+            return
+        w, h = 200, 60
+        panel = pygame.Rect(8, 8, w + 8, h + 8 + 16 * (len(self.phases) + 3))
+        bg = pygame.Surface(panel.size, pygame.SRCALPHA)
+        bg.fill((0, 0, 0, 160))
+        screen.blit(bg, panel)
+        # Frame-Zeit-Graph (letzte w Frames, Linie = Budget bei FPS)
+        budget = 1000.0 / FPS
+        scale = h / (budget * 2)
+        recent = self._recent(self.totals)[-w:]
+        gx, gy = panel.x + 4, panel.y + 4 + h
+        for i, ms in enumerate(recent):
+            col = (90, 220, 90) if ms <= budget else (240, 80, 60)
+            pygame.draw.line(screen, col, (gx + i, gy), (gx + i, gy - min(h, int(ms * scale))))
+        pygame.draw.line(screen, (255, 255, 255), (gx, gy - int(budget * scale)), (gx + w, gy - int(budget * scale)))
+        s = self.stats()
+        lines = [f"frame {s['frame_avg']:.2f} ms  p95 {s['frame_p95']:.2f}  p99 {s['frame_p99']:.2f}"]
+        lines += [f"{p:<10} {s[p]:6.2f} ms" for p in self.phases]
+        lines.append("  ".join(f"{k} {v}" for k, v in self.counts.items()))
+        y = gy + 4
+        for line in lines:
+            screen.blit(font.render(line, True, (255, 255, 255)), (gx, y))
+            y += 16
+
+
+def handle_profiler_key(profiler, key):
+    if key == pygame.K_F3:
+        profiler.toggle()
+    elif key == pygame.K_F4 and profiler.filled and not IS_WEB:
+        profiler.export_csv()
+
+
+# --- Qualitätsstufen (F7 = feste Stufe durchschalten / automatisch) ---
+# Optionale Zeichenarbeit, die auf schwachen Geräten wegfallen darf.
+# Stufe 0 = alles an. Jede weitere Stufe spart zusätzlich etwas ein; die Spiellogik ist davon nie
+# betroffen (Kollision, Replays und Parität bleiben gleich).
+QUALITY_TIERS = [
+    {"name": "hoch",    "wing_shadows": True,  "halo": True,  "title": "rotozoom", "fades": True},
+    {"name": "mittel",  "wing_shadows": False, "halo": True,  "title": "scale",    "fades": True},
+    {"name": "niedrig", "wing_shadows": False, "halo": False, "title": "scale",    "fades": True},
+    {"name": "minimal", "wing_shadows": False, "halo": False, "title": "static",   "fades": False},
+]
+QUALITY = dict(QUALITY_TIERS[0])   # aktuelle Stufe; der QualityGovernor schaltet um
+QUALITY_WINDOW = 90                # Frames im gleitenden Fenster (1,5 s bei 60 FPS)
+QUALITY_DOWN = 0.85                # Ø-Arbeitszeit über 85 % des Frame-Budgets → eine Stufe runter
+QUALITY_UP = 0.5                   # unter 50 % → eine Stufe rauf …
+QUALITY_UP_HOLD = 5.0              # … aber frühestens so viele Sekunden nach dem letzten Wechsel
+QUALITY_UP_HOLD_MAX = 60.0         # Obergrenze, wenn das Hochstufen immer wieder zurückfällt
+
+
+def quality_tier(value) -> int:
+    """Stufe aus Index oder Name ("hoch", "2", …)."""
+    names = [t["name"] for t in QUALITY_TIERS]
+    if isinstance(value, str) and value in names:
+        return names.index(value)
+    try:
+        i = int(value)
+    except (TypeError, ValueError):
+        i = -1
+    if not 0 <= i < len(QUALITY_TIERS):
+        raise ValueError(f"unbekannte Qualitätsstufe: {value!r} (erlaubt: {', '.join(names)})")
+    return i
+
+
+class QualityGovernor:
+    """Wählt die Qualitätsstufe anhand der Arbeitszeit pro Frame (ohne das Warten auf den nächsten Frame)
+    über ein gleitendes Fenster. Hysterese: runter ab QUALITY_DOWN, rauf erst unter QUALITY_UP und nach
+    QUALITY_UP_HOLD Sekunden; fällt eine hochgestufte Stufe gleich wieder zurück, verdoppelt sich die
+    Wartezeit. forced = feste Stufe (F7 / --quality), dann regelt nichts. Wechsel landen in self.log.
+    """
+
+    def __init__(self, forced=None, window=QUALITY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.forced = None
+        self.tier = 0
+        self.changed_at = time.perf_counter()
+        self.last_up = None
+        self.up_hold = QUALITY_UP_HOLD
+        self.skip = False   # laufenden Frame nicht werten (siehe skip_frame)
+        self.log = []       # (Zeitpunkt, alte Stufe, neue Stufe, Ø ms, Grund)
+        self._apply(0)
+        if forced is not None:
+            self.force(forced)
+
+    @property
+    def name(self):
+        return QUALITY_TIERS[self.tier]["name"]
+
+    def _apply(self, tier):
+        self.tier = tier
+        QUALITY.clear()
+        QUALITY.update(QUALITY_TIERS[tier])
+
+    def _switch(self, tier, avg, now, reason):
+        old = self.name
+        self._apply(tier)
+        self.samples.clear()
+        self.changed_at = now
+        self.log.append((now, old, self.name, avg, reason))
+        dbg(f"Qualität: {old} → {self.name} ({reason}" + (f", Ø {avg:.2f} ms)" if avg is not None else ")"))
+
+    def force(self, value):
+        """Feste Stufe setzen; None → wieder automatisch regeln."""
+        self.forced = None if value is None else quality_tier(value)
+        if self.forced is not None and self.forced != self.tier:
+            self._switch(self.forced, None, time.perf_counter(), "fest")
+        else:
+            self.samples.clear()
+            dbg("Qualität:", self.name, "(automatisch)" if self.forced is None else "(fest)")
+
+    def cycle(self):
+        """F7: automatisch → hoch → … → minimal → automatisch."""
+        if self.forced is None:
+            self.force(0)
+        elif self.forced + 1 < len(QUALITY_TIERS):
+            self.force(self.forced + 1)
+        else:
+            self.force(None)
+
+    def skip_frame(self):
+        """Den laufenden Frame nicht werten: Es lief eine verschachtelte Szene (Charakterauswahl,
+        Ladebildschirm) oder einmalige Arbeit (Neu-Backen nach Maßstabswechsel) – sagt nichts über
+        die Leistung pro Frame."""
+        self.skip = True
+
+    def frame(self, work_ms, now=None):
+        """Arbeitszeit eines Frames melden (ms); schaltet bei Bedarf eine Stufe um."""
+        if self.skip:
+            self.skip = False
+            return
+        if self.forced is not None:
+            return
+        self.samples.append(work_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return
+        now = time.perf_counter() if now is None else now
+        avg = sum(self.samples) / len(self.samples)
+        budget = 1000.0 / FPS
+        if avg > QUALITY_DOWN * budget and self.tier + 1 < len(QUALITY_TIERS):
+            if self.last_up is not None and now - self.last_up < 2 * self.up_hold:
+                self.up_hold = min(self.up_hold * 2, QUALITY_UP_HOLD_MAX)
+            self._switch(self.tier + 1, avg, now, "zu langsam")
+        elif avg < QUALITY_UP * budget and self.tier > 0 and now - self.changed_at >= self.up_hold:
+            self.last_up = now
+            self._switch(self.tier - 1, avg, now, "Reserve")
+
+    def report(self) -> str:
+        mode = "automatisch" if self.forced is None else "fest"
+        return f"{self.name} ({mode}), {len(self.log)} Wechsel"
+
+
+def handle_quality_key(governor, key):
+    if key == pygame.K_F7:
+        governor.cycle()
+
+
+# --- Spielwelt (Logik ohne Anzeige) ---
+def make_placeholder_face(size: int = FACE_SIZE) -> pygame.Surface:
+    """Weiße Fläche, zugeschnitten wie ein echtes Gesicht (crop_face_circle, inkl. Rand) – gleiche Form
+    und damit gleiche Kollisionsmasken, ohne Bild zu laden."""
+    img = pygame.Surface((size, size))
+    img.fill((255, 255, 255))
+    return crop_face_circle(img)
+
+
+def make_placeholder_collectible(spec: dict) -> pygame.Surface:
+    """Platzhalter mit denselben Maßen wie make_collectible_sprite (inkl. Halo-Rand). Nur zum
+    Zeichnen; kollidiert wird immer mit get_collectible_mask (echte Form)."""
+    size = spec.get("size", 64)
+    pad = COLLECTIBLE_HALO_PAD
+    surf = pygame.Surface((size + pad*2, size + pad*2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (255, 255, 255, 255), (size // 2 + pad, size // 2 + pad), size // 2)
+    return surf
+
+
+class World:
+    """Komplette Spiellogik (Spawnen, Physik, Kollisionen, Punkte) ohne Display und ohne Zeichnen.
+    reset(seed) startet einen Lauf, step(dt, flap) rechnet einen Sim-Schritt (dt = SIM_DT) und liefert Ereignisse.
+    Mit headless=True braucht sie kein Fenster: Vogel und Collectibles bekommen gleich große Platzhalterbilder,
+    kollidiert wird aber mit den echten Collectible-Masken (einmal geladen), wie im Spiel.
+    """
+    BIRD_START = (100, HEIGHT // 2)
+
+    def __init__(self, face_surface=None, headless=False, wings=None):
+        self.headless = headless
+        if headless:
+            face_surface = make_placeholder_face()
+            wings = (pygame.Surface(WING_SIZE, pygame.SRCALPHA), pygame.Surface(WING_SIZE, pygame.SRCALPHA))
+        self.bird = Bird(*self.BIRD_START, face_surface, wings=wings)
+        self.sprites = pygame.sprite.Group()   # Zeichenreihenfolge: Vogel, dann Säulen/Items
+        self.pipes = SweepGroup()
+        self.collectibles = SweepGroup()
+        self.pools = {"pipe": SpritePool(Pipe), "collectible": SpritePool(Collectible)}
+        self.queue = PipeQueue()
+        self._placeholders = {}
+        self.level = None   # LevelStream des Laufs, kommt mit reset()
+        self.force_collectible_key = None  # Debug: nächsten Spawn auf ein bestimmtes Item erzwingen
+        self.profiler = FrameProfiler()   # vom Client ersetzt, wenn profiliert wird
+        self.reset()
+
+    def reset(self, seed=None):
+        """Neuer Lauf. Ohne seed wird einer gewürfelt (steht danach in self.seed)."""
+        self.queue.clear()
+        release_all(self.pipes)
+        release_all(self.collectibles)
+        self.level = LevelStream(seed)
+        self.seed = self.level.seed
+        self.flap_ticks = []        # Sim-Schritte mit Flap → Replay
+        self.ghost_ys = array("h")    # Höhe nach jedem Sim-Schritt (Viertelpixel) → Geist
+        self.ghost_rots = array("h")  # Rotationsstufe nach jedem Sim-Schritt → Geist
+        self.debug_used = False
+        self.score = 0
+        self.frame = 0
+        self.bird.reset(*self.BIRD_START)
+        self.sprites.add(self.bird)
+
+    def _collectible_image(self, spec):
+        if not self.headless:
+            return None
+        key = spec_key(spec)
+        img = self._placeholders.get(key)
+        if img is None:
+            img = self._placeholders[key] = make_placeholder_collectible(spec)
+        return img
+
+    def _spawn(self):
+        # Pipes spawnen (größerer Abstand = leichter)
+        x = self.queue.spawn_x
+        segment = self.level.next()
+        top_p, bot_p, gap_center_y = spawn_pipe_pair(self.sprites, self.pipes, x,
+                                                     self.pools["pipe"], segment=segment)
+        self.queue.push(top_p, bot_p, gap_center_y)
+        spec = segment.item
+        if spec is not None:
+            if self.force_collectible_key:
+                # Spezifisches Item erzwingen (Debug; der Zufallsstrom läuft trotzdem gleich weiter)
+                spec = next((c for c in COLLECTIBLES if c["key"] == self.force_collectible_key), spec)
+                self.force_collectible_key = None
+                self.debug_used = True
+            col = self.pools["collectible"].acquire(spec, x + 30, gap_center_y,
+                                                    self._collectible_image(spec))
+            self.sprites.add(col)
+            self.collectibles.add(col)
+
+    def step(self, dt, flap=False):
+        """Einen Sim-Schritt weiterrechnen. Gibt Ereignisse zurück:
+        ("pickup", (x, y, punkte, farbe)), ("score", 1), ("dead", None).
+        """
+        events = []
+        bird = self.bird
+        if flap:
+            bird.flap()
+        if not bird.alive:
+            return events
+        if flap:
+            self.flap_ticks.append(self.frame)
+        self.frame += 1
+
+        if self.queue.due(self.level.peek().spacing):
+            self._spawn()
+
+        self.sprites.update(dt)
+        self.queue.cull()
+        self.pipes.advance(dt)
+        self.collectibles.advance(dt)
+        self.profiler.lap("update")
+        self.collide(events)
+        self.profiler.lap("collide")
+        self.ghost_ys.append(round(bird.y * GHOST_Y_UNITS))
+        self.ghost_rots.append(round(bird.rotation / bird.frames.step))
+        return events
+
+    def collide(self, events):
+        """Kollisionen, Einsammeln, Boden und Punkte für den aktuellen Zustand auswerten."""
+        bird = self.bird
+        left, right = bird.rect.left, bird.rect.right
+        # Kollisionen: Sweep-Liste liefert nur Säulen auf Höhe des Vogels, dann Rechteck (billig),
+        # nur bei Treffer pixelgenau über die vorberechneten Masken
+        for p in self.pipes.query(left, right):
+            if bird.rect.colliderect(p.rect) and pygame.sprite.collide_mask(bird, p):
+                bird.alive = False
+
+        # Kollision mit Collectibles (alle Typen)
+        for col in self.collectibles.query(left, right):
+            if bird.rect.colliderect(col.rect) and pygame.sprite.collide_mask(bird, col):
+                self.score += col.points
+                events.append(("pickup", (col.rect.centerx, col.rect.top, col.points, col.pop_color)))
+                col.release()
+
+        # Boden
+        if bird.rect.bottom >= HEIGHT - 120:
+            bird.place_bottom(HEIGHT - 120)
+            bird.alive = False
+
+        # Score (wenn ein Säulenpaar passiert ist)
+        for _ in range(self.queue.score(left)):
+            self.score += 1
+            events.append(("score", 1))
+
+        if not bird.alive:
+            events.append(("dead", None))
+
+    def next_gaps(self, n=1):
+        """Mitten der nächsten n Lücken vor dem Vogel [(x, y), …] (für Bots und HUD)."""
+        return [(pair.top.rect.centerx, pair.gap_y) for pair in self.queue.upcoming(n)]
+
+    def next_gap(self):
+        """Mitte der nächsten Lücke vor dem Vogel (x, y) oder None."""
+        gaps = self.next_gaps(1)
+        return gaps[0] if gaps else None
+
+
+def simple_bot(world: World) -> bool:
+    """Einfacher deterministischer Autopilot: flappen, wenn unter der nächsten Lückenmitte und fallend."""
+    gap = world.next_gap()
+    target = gap[1] if gap else HEIGHT // 2
+    return world.bird.rect.centery > target + 20 and world.bird.vel > 0
+
+
+def run_headless(seed=None, frames=10000, policy=simple_bot, dt=SIM_DT, world=None):
+    """Spielt einen Lauf ohne Fenster. Gibt die Welt nach Ende (Tod oder frames) zurück."""
+    world = world or World(headless=True)
+    world.reset(seed)
+    for _ in range(frames):
+        world.step(dt, policy(world))
+        if not world.bird.alive:
+            break
+    return world
+
+
+# --- Replays (Seed + Flap-Schritte, kompakt binär) ---
+REPLAY_MAGIC = b"FAKR"
+REPLAY_VERSION = 1
+REPLAY_DIR = "replays"
+_REPLAY_HEADER = struct.Struct("<4sBBHQII")   # magic, version, flags, sim_hz, seed, score, ticks
+
+
+class Replay:
+    """Ein aufgezeichneter Lauf: Seed, Sim-Schritte mit Flap, Endstand."""
+    FLAG_DEBUG = 1   # Debug-Taste benutzt → Lauf ist nicht regelkonform
+
+    def __init__(self, seed, flap_ticks, score, ticks, flags=0, sim_hz=SIM_HZ):
+        self.seed = seed
+        self.flap_ticks = list(flap_ticks)
+        self.score = score
+        self.ticks = ticks
+        self.flags = flags
+        self.sim_hz = sim_hz
+
+    @classmethod
+    def from_world(cls, world):
+        flags = cls.FLAG_DEBUG if world.debug_used else 0
+        return cls(world.seed, world.flap_ticks, world.score, world.frame, flags)
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(_REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.flags, self.sim_hz,
+                                            self.seed, self.score, self.ticks))
+        # Abstände zwischen Flaps als LEB128-Varint (meist 1 Byte pro Flap)
+        prev = 0
+        for t in self.flap_ticks:
+            d = t - prev
+            prev = t
+            while True:
+                b = d & 0x7F
+                d >>= 7
+                out.append(b | (0x80 if d else 0))
+                if not d:
+                    break
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        magic, version, flags, sim_hz, seed, score, ticks = _REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("kein FlappyAkh-Replay (oder falsche Version)")
+        flap_ticks = []
+        t = d = shift = 0
+        for b in data[_REPLAY_HEADER.size:]:
+            d |= (b & 0x7F) << shift
+            shift += 7
+            if not b & 0x80:
+                t += d
+                flap_ticks.append(t)
+                d = shift = 0
+        return cls(seed, flap_ticks, score, ticks, flags, sim_hz)
+
+    def save(self, path):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    """Liefert pro Sim-Schritt, ob im aufgezeichneten Lauf geflappt wurde."""
+
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.flaps = set(replay.flap_ticks)
+
+    def flap_at(self, tick) -> bool:
+        return tick in self.flaps
+
+    def done(self, tick) -> bool:
+        return tick >= self.replay.ticks
+
+
+def play_replay(replay: Replay, world=None):
+    """Spielt ein Replay ohne Fenster so schnell wie möglich ab. Gibt die Welt danach zurück."""
+    if replay.sim_hz != SIM_HZ:
+        raise ValueError(f"Replay mit {replay.sim_hz} Hz aufgenommen, Spiel läuft mit {SIM_HZ} Hz")
+    world = world or World(headless=True)
+    world.reset(replay.seed)
+    player = ReplayPlayer(replay)
+    while world.bird.alive and not player.done(world.frame):
+        world.step(SIM_DT, player.flap_at(world.frame))
+    return world
+
+
+def verify_replay(replay: Replay) -> bool:
+    """True, wenn das Nachspielen denselben Endstand und dieselbe Länge ergibt."""
+    world = play_replay(replay)
+    return world.score == replay.score and world.frame == replay.ticks
+
+
+# --- Geister (frühere Läufe auf demselben Kurs mitfliegen lassen) ---
+GHOST_MAGIC = b"FAKG"
+GHOST_VERSION = 3
+_GHOST_HEADER = struct.Struct("<4sBBHfQII")   # magic, version, y_units, sim_hz, rot_step, seed, score, ticks
+GHOST_Y_UNITS = 4            # Höhe in Viertelpixeln (int16)
+GHOST_ALPHA = 90             # Deckkraft der Geister (0–255)
+GHOST_STRESS_TICKS = 5 * 60 * SIM_HZ   # Länge des Bot-Laufs, aus dem der Stresstest seine Geister macht
+GHOST_STRESS_SPREAD = 90     # Stresstest: Geister bis zu so viele Pixel über/unter der Bot-Bahn
+
+
+class GhostTrack:
+    """Flugbahn eines Laufs: pro Sim-Schritt Höhe (Viertelpixel, int16) und Rotationsstufe (int16, Stufen
+    à step Grad – int8 reicht bei feinem ROTATION_STEP nicht). 4 Bytes pro Schritt im Speicher, in der
+    Datei zusätzlich mit zlib gepackt.
+    """
+
+    def __init__(self, seed, ys, rots, score=0, sim_hz=SIM_HZ, step=ROTATION_STEP):
+        self.seed = seed
+        self.ys = ys
+        self.rots = rots
+        self.score = score
+        self.sim_hz = sim_hz
+        self.step = step
+
+    def __len__(self):
+        return len(self.ys)
+
+    @classmethod
+    def from_world(cls, world):
+        return cls(world.seed, world.ghost_ys, world.ghost_rots, world.score, step=world.bird.frames.step)
+
+    @classmethod
+    def from_replay(cls, replay: Replay):
+        """Bahn eines Replays durch Nachspielen ohne Fenster."""
+        return cls.from_world(play_replay(replay))
+
+    def to_bytes(self) -> bytes:
+        ys, rots = array("h", self.ys), array("h", self.rots)
+        if sys.byteorder == "big":
+            ys.byteswap()   # Datei immer little-endian
+            rots.byteswap()
+        header = _GHOST_HEADER.pack(GHOST_MAGIC, GHOST_VERSION, GHOST_Y_UNITS, self.sim_hz, self.step,
+                                    self.seed, self.score, len(self))
+        return header + zlib.compress(ys.tobytes() + rots.tobytes(), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        try:
+            magic, version, units, sim_hz, step, seed, score, ticks = _GHOST_HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError("Geisterbahn zu kurz") from None
+        if magic != GHOST_MAGIC or version != GHOST_VERSION or units != GHOST_Y_UNITS:
+            raise ValueError("keine FlappyAkh-Geisterbahn (oder falsche Version)")
+        if not step > 0:
+            raise ValueError("Geisterbahn beschädigt")
+        raw = zlib.decompress(data[_GHOST_HEADER.size:])
+        if len(raw) != 4 * ticks:
+            raise ValueError("Geisterbahn beschädigt")
+        ys, rots = array("h", raw[:2 * ticks]), array("h", raw[2 * ticks:])
+        if sys.byteorder == "big":
+            ys.byteswap()
+            rots.byteswap()
+        return cls(seed, ys, rots, score, sim_hz, step)
+
+    def save(self, path):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def _load_ghost(base, stem, names):
+    """Bahn zu stem: gespeicherte *.fakg, sonst (fehlt/alt/kaputt) das Replay daneben nachspielen."""
+    if stem + ".fakg" in names:
+        try:
+            return GhostTrack.load(os.path.join(base, stem + ".fakg"))
+        except (OSError, ValueError, zlib.error) as e:
+            dbg("Geist nicht geladen:", stem + ".fakg", e)
+    if stem + ".fakr" in names:
+        try:
+            replay = Replay.load(os.path.join(base, stem + ".fakr"))
+        except (OSError, ValueError) as e:
+            dbg("Replay nicht geladen:", stem + ".fakr", e)
+            return None
+        if not replay.flags and replay.sim_hz == SIM_HZ:
+            return GhostTrack.from_replay(replay)
+    return None
+
+
+def load_ghosts(seed=None, base=None):
+    """Gespeicherte Läufe aus replays/ als Geister (*.fakg; Replays ohne gültige Bahn werden nachgespielt).
+    Ohne seed gilt der Kurs des besten Laufs. Gibt (seed, Bahnen auf diesem Kurs, beste zuerst) zurück.
+    """
+    base = base or os.path.join(os.path.dirname(os.path.abspath(__file__)), REPLAY_DIR)
+    names = set(os.listdir(base)) if os.path.isdir(base) else set()
+    tracks, seen = [], set()
+    for stem in sorted({os.path.splitext(n)[0] for n in names if n.endswith((".fakg", ".fakr"))}):
+        track = _load_ghost(base, stem, names)
+        if track is None:
+            continue
+        key = (track.seed, track.ys.tobytes())   # best.* und last.* sind oft derselbe Lauf
+        if track.sim_hz == SIM_HZ and key not in seen:
+            seen.add(key)
+            tracks.append(track)
+    tracks.sort(key=lambda t: -t.score)
+    if seed is None and tracks:
+        seed = tracks[0].seed
+    return seed, [t for t in tracks if t.seed == seed]
+
+
+def stress_ghosts(seed, n, ticks=GHOST_STRESS_TICKS):
+    """n Geister für den Stresstest: ein Bot-Lauf auf dem Kurs, pro Geist zeitlich und in der Höhe
+    versetzt. Sie fliegen nicht sauber durch die Lücken, kosten beim Zeichnen aber genauso viel.
+    """
+    base = GhostTrack.from_world(run_headless(seed, frames=ticks))
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        shift = rng.randrange(SIM_HZ)   # bis zu 1 s Vorsprung
+        dy = rng.randint(-GHOST_STRESS_SPREAD, GHOST_STRESS_SPREAD) * GHOST_Y_UNITS
+        out.append(GhostTrack(seed, array("h", [y + dy for y in base.ys[shift:]]), base.rots[shift:]))
+    return out
+
+
+def ghost_image(body):
+    """Durchscheinende Kopie eines vorgedrehten Gesichts."""
+    img = body.copy()
+    img.fill((255, 255, 255, GHOST_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+    return img
+
+
+class GhostLayer:
+    """Zeichnet beliebig viele Geister in einem Durchgang. Alle teilen sich einen Satz vorgedrehter,
+    durchscheinender Gesichter (eins pro Rotationsstufe, ohne Flügel und Schatten); pro Frame bleibt
+    je Geist nur das Nachschlagen in seiner Bahn und ein Eintrag für ein einziges screen.blits().
+    Geister, deren Lauf zu Ende ist, verschwinden.
+    """
+
+    def __init__(self, frames: BirdFrames, tracks=()):
+        self.tracks = []       # (ys, rots) – nur was draw() braucht
+        self.drawn = 0
+        self.set_frames(frames)
+        for track in tracks:
+            self.add(track)
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def set_frames(self, frames: BirdFrames):
+        """Geisterbilder aus den Rotationsstufen des Vogels bauen (neu nach Charakterwechsel)."""
+        self.step = frames.step
+        self.lo = min(frames.body)
+        self.hi = max(frames.body)
+        self.images = [set_recipe(ghost_image(body), lambda view, body=body: ghost_image(view.surf(body)))
+                       for body in (frames.body[i] for i in range(self.lo, self.hi + 1))]
+        self._scale = None
+
+    def add(self, track: GhostTrack):
+        """Bahn übernehmen; mit anderer Stufenweite aufgenommene Stufen werden umgerechnet und auf die
+        vorhandenen Bilder begrenzt, damit draw() ohne Prüfung indizieren kann."""
+        rots, lo, hi = track.rots, self.lo, self.hi
+        if rots and (track.step != self.step or min(rots) < lo or max(rots) > hi):
+            f = track.step / self.step
+            rots = array("h", [min(hi, max(lo, round(r * f))) for r in rots])
+        self.tracks.append((track.ys, rots))
+
+    def _frames(self, view):
+        # (Bild, halbe Breite, halbe Höhe) pro Rotationsstufe im Maßstab der View
+        if view.scale != self._scale:
+            self._scale = view.scale
+            self._scaled = [(img, img.get_width() // 2, img.get_height() // 2)
+                            for img in map(view.surf, self.images)]
+        return self._scaled
+
+    def draw(self, screen, view, tick, alpha=1.0):
+        """Alle Geister nach tick Sim-Schritten zeichnen (zwischen den letzten beiden interpoliert)."""
+        frames = self._frames(view)
+        x = view.rect.x + round(World.BIRD_START[0] * view.scale)
+        oy = view.rect.y
+        s = view.scale / GHOST_Y_UNITS
+        lo = self.lo
+        cur = max(tick - 1, 0)
+        prev = max(tick - 2, 0)
+        seq = []
+        append = seq.append
+        for ys, rots in self.tracks:
+            if cur >= len(ys):
+                continue
+            y0 = ys[prev]
+            img, hw, hh = frames[rots[cur] - lo]
+            append((img, (x - hw, oy + round((y0 + (ys[cur] - y0) * alpha) * s) - hh)))
+        screen.blits(seq, doreturn=False)
+        self.drawn = len(seq)
+
+
+# --- Eingabe-Latenz (F8 = Histogramm ausgeben) ---
+LATENCY_BUCKET_MS = 2
+LATENCY_BUCKETS = 40       # 0 … 80 ms, der letzte Eimer sammelt alles darüber
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN)
+
+
+class InputLatency:
+    """Misst pro Eingabe die Zeit bis zum ersten angezeigten Frame, der sie enthält.
+    pygame-Events tragen keinen Zeitstempel: eine Eingabe kam irgendwann zwischen vorletztem und letztem
+    Poll an, gezählt wird ab der Mitte dieser Lücke (so ist die Wartezeit in der Queue mit drin).
+    Gemessen werden nur Flaps (SPACE/Klick im Spiel): sichtbar erst, wenn ein Sim-Schritt sie verarbeitet
+    hat (applied); presented() nach dem flip bucht die Zeiten ins Histogramm. Menü- und F-Tasten zählen
+    nicht – RETURN öffnet z. B. die Charakterauswahl, bis zum nächsten Spiel-Frame vergehen Sekunden.
+    """
+
+    def __init__(self, bucket_ms=LATENCY_BUCKET_MS, buckets=LATENCY_BUCKETS, keep=512):
+        self.bucket_ms = bucket_ms
+        self.hist = [0] * buckets
+        self.recent = deque(maxlen=keep)   # letzte Einzelwerte (ms) für Perzentile
+        self.pending = []                  # Flaps, die noch kein Sim-Schritt verarbeitet hat
+        self.applied = []                  # warten auf den nächsten angezeigten Frame
+        self.poll_at = self.prev_poll = time.perf_counter()
+        self.last_ms = 0.0
+
+    def polled(self, since=None):
+        """Direkt vor pygame.event.get(); since = letzter Poll ohne Eingabe, falls genauer bekannt."""
+        now = time.perf_counter()
+        self.prev_poll = self.poll_at if since is None else since
+        self.poll_at = now
+
+    def input(self):
+        """Flap-Eingabe aus dem letzten Poll."""
+        self.pending.append(self.poll_at - (self.poll_at - self.prev_poll) / 2)
+
+    def apply(self):
+        """Ein Sim-Schritt hat den Flap verarbeitet → ab jetzt im nächsten Frame sichtbar."""
+        self.applied.extend(self.pending)
+        self.pending.clear()
+
+    def drop(self):
+        """Flap verworfen (tot / nicht im Spiel) → erscheint nie, wird nicht gezählt."""
+        self.pending.clear()
+
+    def presented(self):
+        if not self.applied:
+            return
+        now = time.perf_counter()
+        last = len(self.hist) - 1
+        for t in self.applied:
+            ms = (now - t) * 1000.0
+            self.hist[min(last, int(ms / self.bucket_ms))] += 1
+            self.recent.append(ms)
+        self.last_ms = ms
+        self.applied.clear()
+
+    def stats(self) -> dict:
+        vals = sorted(self.recent)
+        n = len(vals)
+        if not n:
+            return {}
+        return {"count": sum(self.hist), "p50": vals[n // 2], "p95": vals[min(n - 1, int(n * 0.95))],
+                "p99": vals[min(n - 1, int(n * 0.99))], "max": vals[-1]}
+
+    def histogram(self):
+        """[(ab ms, Anzahl), …] – der letzte Eimer ist offen nach oben."""
+        return [(i * self.bucket_ms, c) for i, c in enumerate(self.hist)]
+
+    def report(self) -> str:
+        s = self.stats()
+        if not s:
+            return "keine Eingaben"
+        return (f"{s['count']} Eingaben, p50 {s['p50']:.1f} ms  p95 {s['p95']:.1f}  "
+                f"p99 {s['p99']:.1f}  max {s['max']:.1f}")
+
+    def histogram_text(self, width=40) -> str:
+        top = max(self.hist) or 1
+        used = [i for i, c in enumerate(self.hist) if c]
+        if not used:
+            return self.report()
+        lines = [self.report()]
+        for i in range(used[0], used[-1] + 1):
+            lo = i * self.bucket_ms
+            label = f"{lo:>3}+ ms" if i == len(self.hist) - 1 else f"{lo:>3}–{lo + self.bucket_ms:<3}"
+            lines.append(f"{label} {'#' * round(self.hist[i] / top * width):<{width}} {self.hist[i]}")
+        return "\n".join(lines)
+
+
+class LowLatencyPacer:
+    """Frame-Takt im Low-Latency-Modus (Desktop). Statt blind bis zum nächsten Frame zu schlafen, wird
+    in 1-ms-Scheiben gewartet und dabei die Event-Queue angeschaut: kommt eine Eingabe, startet der Frame
+    sofort (Eingaben werden so spät wie möglich abgeholt). Ohne Eingabe übernimmt clock.tick_busy_loop
+    die letzten Millisekunden, damit der Takt genau bleibt.
+    """
+    SPIN_MS = 2
+
+    def __init__(self):
+        self.last_tick = pygame.time.get_ticks()
+        self.last_quiet = time.perf_counter()   # letzter Blick in die Queue ohne Eingabe
+
+    def wait(self, clock):
+        deadline = self.last_tick + 1000.0 / FPS
+        while pygame.time.get_ticks() < deadline - self.SPIN_MS:
+            if pygame.event.peek(INPUT_EVENTS):
+                ms = clock.tick()
+                break
+            self.last_quiet = time.perf_counter()
+            time.sleep(0.001)
+        else:
+            ms = clock.tick_busy_loop(FPS)
+        self.last_tick = pygame.time.get_ticks()
+        return ms
+
+
+# --- Frame-Schleifen (async, damit der Browser unter pygbag jeden Frame die Kontrolle bekommt) ---
+async def next_frame(clock, pacer=None):
+    """Einmal pro Frame aufrufen: gibt an die Event-Loop ab und liefert die Frame-Zeit in ms.
+    Im Browser taktet requestAnimationFrame (kein eigenes FPS-Limit), am Desktop clock.tick(FPS)
+    bzw. im Low-Latency-Modus der LowLatencyPacer.
+    """
+    await asyncio.sleep(0)
+    if IS_WEB:
+        return clock.tick()
+    return pacer.wait(clock) if pacer else clock.tick(FPS)
+
+
+async def wait_for_key(clock=None):
+    """Wartet auf Taste, Klick oder Schließen, ohne die Event-Loop zu blockieren."""
+    clock = clock or pygame.time.Clock()
+    while True:
+        for ev in pygame.event.get():
+            if ev.type in (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                return
+        await next_frame(clock)
+
+
+# --- Asset-Loader (Dekodieren + Skalieren im Thread-Pool, convert_alpha im Hauptthread) ---
+ASSET_WORKERS = 4
+
+
+class AssetLoader:
+    """Lädt Bilder im Hintergrund, während der Hauptthread weiter Frames zeichnet.
+    submit(name, fn, *args) startet fn im Thread-Pool (Future); get(name) wartet darauf und wendet
+    finish (Standard: convert_alpha) im Hauptthread an. Mit after=name läuft ein Auftrag erst nach einem
+    anderen – direkt im Hauptthread (z. B. Subsurfaces, sobald der Atlas da ist).
+    Im Browser gibt es keine Threads: dort läuft pro Frame ein Auftrag in wait().
+    """
+
+    def __init__(self, workers=ASSET_WORKERS):
+        self.pool = None if IS_WEB else ThreadPoolExecutor(workers, thread_name_prefix="assets")
+        self.jobs = {}          # name → (fn, args, finish, after)
+        self.futures = {}
+        self.pending = deque()  # ohne Thread-Pool: (Future, fn, args)
+        self.results = {}
+
+    def submit(self, name, fn, *args, finish=None, after=None):
+        if name in self.jobs:
+            return
+        self.jobs[name] = (fn, args, finish or (lambda s: s.convert_alpha()), after)
+        if after is not None:
+            return
+        if self.pool is not None:
+            self.futures[name] = self.pool.submit(fn, *args)
+        else:
+            fut = self.futures[name] = Future()
+            self.pending.append((fut, fn, args))
+
+    def _run_pending(self):
+        if self.pending:
+            fut, fn, args = self.pending.popleft()
+            try:
+                fut.set_result(fn(*args))
+            except Exception as e:
+                fut.set_exception(e)
+
+    def ready(self, name):
+        if name in self.results:
+            return True
+        after = self.jobs[name][3]
+        return self.ready(after) if after is not None else self.futures[name].done()
+
+    def get(self, name):
+        """Fertiges Asset (blockiert, falls es noch lädt – vorher wait() für einen Ladebildschirm)."""
+        if name in self.results:
+            return self.results[name]
+        fn, args, finish, after = self.jobs[name]
+        if after is not None:
+            self.get(after)
+            value = fn(*args)
+        else:
+            fut = self.futures[name]
+            while not fut.done() and self.pending:
+                self._run_pending()
+            raw = fut.result()
+            value = finish(raw)
+            if isinstance(value, pygame.Surface):
+                copy_recipe(raw, value)   # convert_alpha liefert ein neues Surface
+        self.results[name] = value
+        return value
+
+    async def wait(self, names, screen, clock, font, title="Lade Bilder"):
+        """Ladebildschirm, bis alle names fertig sind; gibt dabei jeden Frame an die Event-Loop ab."""
+        names = list(names)
+        background = get_background(screen.get_size())
+        while True:
+            self._run_pending()
+            done = sum(self.ready(n) for n in names)
+            if done == len(names):
+                return
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT:
+                    raise SystemExit
+            w, h = screen.get_size()
+            background.draw(screen)
+            label = render_text(font, f"{title} … {done}/{len(names)}", BLACK)
+            screen.blit(label, label.get_rect(center=(w // 2, h // 2 - 30)))
+            bar = pygame.Rect(0, 0, w * 2 // 3, 18)
+            bar.center = (w // 2, h // 2 + 10)
+            pygame.draw.rect(screen, (255, 255, 255), bar, border_radius=9)
+            fill = bar.inflate(-6, -6)
+            fill.width = max(1, fill.width * done // len(names))
+            pygame.draw.rect(screen, (255, 220, 0), fill, border_radius=6)
+            pygame.display.flip()
+            await next_frame(clock)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def skin_asset(c):
+    return "skin:" + c["skin"]
+
+
+def face_asset(c):
+    return "face:" + c["avatar"]
+
+
+def collectible_asset(spec):
+    return "collectible:" + spec["key"]
+
+
+def queue_startup_assets(loader: AssetLoader):
+    """Alle Bilder für Auswahl und Spiel anstoßen. Mit Atlas wird nur er im Thread dekodiert,
+    die Einzelbilder sind danach billige Subsurfaces; ohne Atlas dekodiert jeder Worker ein Quellbild.
+    """
+    after = None
+    if ATLAS_ENABLED and not _ATLAS_TRIED and os.path.exists(os.path.join(os.path.dirname(__file__), ATLAS_MANIFEST)):
+        def read_atlas():
+            try:
+                return Atlas.read()
+            except Exception as e:
+                dbg("kein Atlas, lade Einzelbilder:", e)
+                return None
+        loader.submit("atlas", read_atlas, finish=install_atlas)
+        after = "atlas"
+    else:
+        get_atlas()   # im Hauptthread entscheiden, damit kein Worker den Atlas lädt
     for c in CHARACTERS:
-        s = load_image_local(c["skin"])
-        s = pygame.transform.smoothscale(s, (140, 140))
-        skins.append(s)
+        loader.submit(skin_asset(c), load_scaled_image, c["skin"], SKIN_SIZE, after=after)
+        loader.submit(face_asset(c), make_face_circle_from_file, c["avatar"], FACE_SIZE, after=after)
+    for f in WING_FILES:
+        loader.submit("wing:" + f, load_scaled_image, f, WING_SIZE, after=after)
+    for spec in COLLECTIBLES:
+        loader.submit(collectible_asset(spec), make_collectible_sprite, spec, after=after)
+
+
+async def character_select(screen, clock, font_big, font, profiler=None, assets=None, governor=None, view=None):
+    """Zeigt die Auswahl für Nizi19/Yuyu19. Gibt Index (0/1) zurück."""
+    profiler = profiler or FrameProfiler()
+    governor = governor or QualityGovernor()
+    view = view or View(screen)
+    overlay_font = get_font(18, name=None)
+    # Skins laden & verkleinern (mit AssetLoader: nur auf die Skins warten, Rest lädt weiter)
+    if assets is not None:
+        await assets.wait([skin_asset(c) for c in CHARACTERS], screen, clock, font)
+        skins = [assets.get(skin_asset(c)) for c in CHARACTERS]
+    else:
+        skins = [load_scaled_image(c["skin"], SKIN_SIZE) for c in CHARACTERS]
+
+    # Hinweise einmal rendern; eigene Kopien, weil set_alpha() pro Frame das Bild verändert
+    hint1 = text_copy(font, "CHOOSE YOUR CHARACTER", BLACK)
+    hint2 = text_copy(font, "click to start", BLACK)
 
     selected = 0
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        dt = await next_frame(clock) / 1000.0
+        frame_start = time.perf_counter()
+        profiler.begin_frame()
         for event in pygame.event.get():
+            if handle_view_event(view, event):
+                governor.skip_frame()
+                continue
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     pygame.quit(); sys.exit(0)
+                handle_profiler_key(profiler, event.key)
+                handle_quality_key(governor, event.key)
                 if event.key in (pygame.K_LEFT, pygame.K_a):
                     selected = (selected - 1) % len(CHARACTERS)
                 if event.key in (pygame.K_RIGHT, pygame.K_d):
@@ -438,7 +2506,7 @@ def character_select(screen, clock, font_big, font):
                 if event.key in (pygame.K_RETURN, pygame.K_SPACE):
                     return selected
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = event.pos
+                mx, my = view.to_logical(event.pos)
                 # Klick-Hitboxen dynamisch anhand der Anzahl der Charaktere
                 spacing = 160
                 n = len(CHARACTERS)
@@ -450,30 +2518,41 @@ def character_select(screen, clock, font_big, font):
                     if r.collidepoint(mx, my):
                         return i
 
-        # Zeichnen
-        draw_background(screen)
+        profiler.lap("events")
+
+        # Zeichnen (logische Koordinaten über die View, auf den Spielbereich beschnitten)
+        screen = view.screen
+        screen.set_clip(view.rect)
+        view.background.update(dt)
+        view.background.draw(screen, view.rect.topleft)
+        profiler.lap("background")
 
         # --- Animated title & hints ---
         t = pygame.time.get_ticks() / 1000.0
 
-        # Puls-Skalierung (sanft) für den Titel
+        # Puls-Skalierung (sanft) für den Titel; niedrigere Qualität: ungefiltert bzw. gar nicht.
+        # Animiert wird das schon im Maßstab gebackene Bild (in Fensterpixeln)
         title_scale = 1.0 + 0.04 * math.sin(t * 2.0 * math.pi * 0.8)
-        title = font_big.render("FlappyAkh", True, WHITE)
-        title_anim = pygame.transform.rotozoom(title, 0, title_scale)
-        screen.blit(title_anim, title_anim.get_rect(center=(WIDTH//2, 118)))
+        title = view.surf(render_text(font_big, "FlappyAkh", WHITE))
+        if QUALITY["title"] == "rotozoom":
+            title_anim = pygame.transform.rotozoom(title, 0, title_scale)
+        elif QUALITY["title"] == "scale":
+            title_anim = pygame.transform.scale(title, (round(title.get_width() * title_scale),
+                                                        round(title.get_height() * title_scale)))
+        else:
+            title_anim = title
+        screen.blit(title_anim, title_anim.get_rect(center=view.point((WIDTH//2, 118))))
 
         # Hints: leichtes Atmen (Alpha) + kleines vertikales Wippen
-        alpha = int(190 + 65 * (0.5 + 0.5 * math.sin(t * 2.0 * math.pi * 1.2)))  # 190..255
+        alpha = int(190 + 65 * (0.5 + 0.5 * math.sin(t * 2.0 * math.pi * 1.2))) if QUALITY["fades"] else None
         bob1 = int(2 * math.sin(t * 2.0 * math.pi * 1.0))
         bob2 = int(2 * math.sin((t + 0.25) * 2.0 * math.pi * 1.0))
 
-        hint1 = font.render("CHOOSE YOUR CHARACTER", True, BLACK)
         hint1.set_alpha(alpha)
-        screen.blit(hint1, hint1.get_rect(center=(WIDTH//2, 170 + bob1)))
+        view.blit(hint1, hint1.get_rect(center=(WIDTH//2, 170 + bob1)))
 
-        hint2 = font.render("click to start", True, BLACK)
         hint2.set_alpha(alpha)
-        screen.blit(hint2, hint2.get_rect(center=(WIDTH//2, 198 + bob2)))
+        view.blit(hint2, hint2.get_rect(center=(WIDTH//2, 198 + bob2)))
 
         # Positionen dynamisch anhand der Anzahl der Charaktere
         spacing = 160
@@ -486,252 +2565,612 @@ def character_select(screen, clock, font_big, font):
             rect = skin.get_rect(center=centers[i])
             # Rahmen (Auswahl)
             border_col = (255, 220, 0) if i == selected else (0, 0, 0)
-            pygame.draw.rect(screen, (255, 255, 255), rect.inflate(12, 12), border_radius=16)
-            pygame.draw.rect(screen, border_col, rect.inflate(12, 12), width=4, border_radius=16)
-            screen.blit(skin, rect)
+            view.draw_rect((255, 255, 255), rect.inflate(12, 12), border_radius=16)
+            view.draw_rect(border_col, rect.inflate(12, 12), width=4, border_radius=16)
+            view.blit(skin, rect)
 
-            name_surf = font.render(c["name"], True, BLACK)
-            screen.blit(name_surf, name_surf.get_rect(midtop=(rect.centerx, rect.bottom + 8)))
+            name_surf = render_text(font, c["name"], BLACK)
+            view.blit(name_surf, name_surf.get_rect(midtop=(rect.centerx, rect.bottom + 8)))
+        screen.set_clip(None)
+        profiler.lap("menu")
 
+        profiler.draw_overlay(screen, overlay_font)
+        profiler.lap("overlay")
         pygame.display.flip()
+        profiler.lap("flip")
+        profiler.end_frame(characters=len(CHARACTERS), quality=governor.name)
+        governor.frame((time.perf_counter() - frame_start) * 1000.0)
+
+
+def world_draw_list(world, ground, popups, alpha=1.0):
+    """Boden, Welt-Sprites (interpoliert) und Popups als (Bild, Rect)-Liste in Zeichenreihenfolge.
+    Säulen und Items kommen nur mit, wenn sie im Bild sind (Sweep-Liste statt aller Sprites).
+    """
+    items = [(ground.image, ground.rect)]
+    items.extend(world.bird.draw_items(alpha))
+    # Interpoliert liegt ein Sprite höchstens einen Sim-Schritt rechts von x
+    margin = Scroller.SPEED * SIM_DT
+    for sprite in world.pipes.query(-margin, WIDTH):
+        rect = sprite.draw_rect(alpha)
+        if rect.right > 0 and rect.left < WIDTH:
+            items.append((sprite.image, rect))
+    halo = QUALITY["halo"]
+    for sprite in world.collectibles.query(-margin, WIDTH):
+        rect = sprite.draw_rect(alpha)
+        if rect.right > 0 and rect.left < WIDTH:
+            items.append((sprite.image, rect) if halo else sprite.bare_item(rect))
+    for sprite in popups:
+        items.append((sprite.image, sprite.rect))
+    return items
+
+
+def draw_world(screen, world, ground, popups, alpha=1.0):
+    screen.blits(world_draw_list(world, ground, popups, alpha))
+
+
+# --- Maßstab / auflösungsunabhängiges Zeichnen (Fenster ziehen oder F11 = Vollbild) ---
+RENDER_SCALE = 1.0     # Maßstab beim Start am Desktop (--scale 2, --scale 1.5); im Browser aus devicePixelRatio
+SCALE_STEP = 0.25      # angepasster Maßstab wird darauf abgerundet (weniger Neu-Backen beim Fensterziehen)
+MIN_SCALE = 0.5
+WEB_SCALES = (1.0, 1.5, 2.0)   # Maßstäbe, die build_web.py mit in den Atlas backt (Browser hat keine Quellbilder)
+
+
+def window_size(scale):
+    return round(WIDTH * scale), round(HEIGHT * scale)
+
+
+def fit_scale(size):
+    """Größter Maßstab (in SCALE_STEP-Schritten), bei dem WIDTH×HEIGHT ins Fenster passt."""
+    s = min(size[0] / WIDTH, size[1] / HEIGHT)
+    return max(MIN_SCALE, math.floor(s / SCALE_STEP + 1e-6) * SCALE_STEP)
+
 
+def web_snap(scale):
+    """Browser: auf den nächstkleineren Maßstab aus WEB_SCALES abrunden. Nur für die gibt es Bilder im
+    Atlas; dazwischen würden die Rezepte mangels Quellbild aus 1× hochskalieren (unscharf)."""
+    if scale <= WEB_SCALES[0]:
+        return scale
+    return max(s for s in WEB_SCALES if s <= scale)
 
-def main():
+
+def web_scale():
+    """Browser: Maßstab aus Fenstergröße × devicePixelRatio (pygbag reicht window über platform durch).
+    Die Seite zeigt die Canvas per CSS wieder in Fenstergröße → scharf auf HiDPI-Bildschirmen.
+    """
+    try:
+        import platform as browser
+        win = browser.window
+        return web_snap(max(1.0, fit_scale((win.innerWidth * win.devicePixelRatio,
+                                            win.innerHeight * win.devicePixelRatio))))
+    except Exception:
+        return 1.0
+
+
+class View:
+    """Bildet logische Koordinaten (WIDTH×HEIGHT) auf das Fenster ab: Maßstab + zentrierter Rand.
+    Statt jeden Frame den fertigen Framebuffer zu skalieren, wird jedes Bild einmal pro Maßstab neu
+    gebacken (Rezept, sonst einmal smoothscale) und gecacht. Ein neuer Maßstab verwirft den Cache;
+    neu gebacken wird erst, was danach wirklich gezeichnet wird. Bei Maßstab 1 ohne Rand ist alles
+    ein Durchreichen.
+    """
+
+    def __init__(self, screen, scale=None):
+        self.scale = None
+        self.windowed = screen.get_size()   # Fenstergröße vor F11 (zum Zurückschalten)
+        self.resize(screen, scale)
+
+    def resize(self, screen, scale=None):
+        """Nach set_mode/Größenänderung; scale=None → passend zum Fenster."""
+        self.screen = screen
+        w, h = screen.get_size()
+        if scale is None:
+            scale = web_snap(fit_scale((w, h))) if IS_WEB else fit_scale((w, h))
+        if scale != self.scale:
+            self.scale = scale
+            self.cache = weakref.WeakKeyDictionary()   # Quelle → Bild in diesem Maßstab
+            self.background = get_background((WIDTH, HEIGHT), scale)
+            dbg(f"Maßstab {scale:g} ({w}×{h})")
+        self.rect = pygame.Rect((0, 0), window_size(scale))
+        self.rect.center = (w // 2, h // 2)
+        self.identity = scale == 1 and self.rect.topleft == (0, 0)
+        screen.fill(BLACK)   # Ränder
+
+    def surf(self, src):
+        """src im aktuellen Maßstab (beim ersten Mal backen); Transparenz von src wird übernommen."""
+        if self.scale == 1:
+            return src
+        out = self.cache.get(src)
+        if out is None:
+            out = self.cache[src] = self._bake(src)
+        alpha = src.get_alpha()
+        if out.get_alpha() != alpha:
+            out.set_alpha(alpha)
+        return out
+
+    def _bake(self, src):
+        recipe = _RECIPES.get(src)
+        if recipe is not None:
+            try:
+                return recipe(self)
+            except Exception as e:
+                # z. B. Web-Bundle ohne Quellbilder → unten aus dem vorhandenen Bild skalieren
+                dbg("Rezept fehlgeschlagen, skaliere:", e)
+        w, h = src.get_size()
+        size = (max(1, round(w * self.scale)), max(1, round(h * self.scale)))
+        if src.get_bitsize() >= 24:
+            return pygame.transform.smoothscale(src, size)
+        return pygame.transform.scale(src, size)
+
+    def point(self, pos):
+        return (self.rect.x + round(pos[0] * self.scale), self.rect.y + round(pos[1] * self.scale))
+
+    def to_screen(self, rect):
+        s = self.scale
+        return pygame.Rect(self.rect.x + round(rect.x * s), self.rect.y + round(rect.y * s),
+                           round(rect.w * s), round(rect.h * s))
+
+    def to_logical(self, pos):
+        return ((pos[0] - self.rect.x) / self.scale, (pos[1] - self.rect.y) / self.scale)
+
+    def items(self, items):
+        """Display-Liste (Bild, Rect) von logischen Koordinaten in Fensterpixel."""
+        if self.identity:
+            return items
+        s, ox, oy = self.scale, self.rect.x, self.rect.y
+        out = []
+        for src, rect in items:
+            img = self.surf(src)
+            out.append((img, img.get_rect(center=(ox + round(rect.centerx * s), oy + round(rect.centery * s)))))
+        return out
+
+    def blit(self, src, rect):
+        """Ein Bild an seiner logischen Position zeichnen (Mitte bleibt Mitte)."""
+        img = self.surf(src)
+        self.screen.blit(img, img.get_rect(center=self.point(rect.center)))
+
+    def draw_rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.screen, color, self.to_screen(rect), width and max(1, round(width * self.scale)),
+                         border_radius=round(border_radius * self.scale))
+
+
+def handle_view_event(view, event):
+    """Fenstergröße geändert oder F11 (Vollbild an/aus) → View anpassen. True, wenn sich etwas geändert hat."""
+    if event.type == pygame.VIDEORESIZE:
+        view.resize(pygame.display.get_surface())
+        return True
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_F11 and not IS_WEB:
+        if view.screen.get_flags() & pygame.FULLSCREEN:
+            screen = pygame.display.set_mode(view.windowed, pygame.RESIZABLE)
+        else:
+            view.windowed = view.screen.get_size()
+            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        view.resize(screen)
+        return True
+    return False
+
+
+# --- Dirty-Rect-Rendering (F6 schaltet um) ---
+DIRTY_RENDERING = False     # True = nur geänderte Bereiche neu zeichnen und übertragen
+DIRTY_FULL_RATIO = 0.5      # ab diesem Anteil geänderter Fläche lieber komplett flippen
+
+
+def merge_rects(rects):
+    """Überlappende Rechtecke zusammenfassen (wenige Rects → wenige Update-Bereiche).
+    merged bleibt paarweise überlappungsfrei: jedes neue Rect schluckt alle Treffer (collidelistall,
+    Schleife in C), bis es nach dem Wachsen nichts mehr berührt."""
+    merged = []
+    for r in rects:
+        r = r.copy()
+        hits = r.collidelistall(merged)
+        while hits:
+            for i in reversed(hits):
+                r.union_ip(merged.pop(i))
+            hits = r.collidelistall(merged)
+        merged.append(r)
+    return merged
+
+
+class DirtyRenderer:
+    """Vergleicht die Display-Liste (Bild, Rect) mit dem letzten Frame und zeichnet nur, was sich
+    geändert hat: Hintergrund unter alten/neuen Rects wiederherstellen, betroffene Einträge geclippt
+    neu blitten, dann display.update(rects). Scrollender Hintergrund, große Änderungen oder
+    invalidate() → normaler Voll-Frame mit flip().
+    """
+
+    def __init__(self, screen, background, bounds=None, full_ratio=DIRTY_FULL_RATIO):
+        self.screen = screen
+        self.background = background
+        self.bounds = bounds or screen.get_rect()   # Spielbereich (mit View: ohne die Ränder)
+        self.full_ratio = full_ratio
+        self.bg = None
+        self.last = {}              # (id, alpha, x, y, w, h) → (Bild, Rect); hält die Bilder am Leben
+        self.force_full = True
+        self.stats = {"full": 0, "partial": 0, "idle": 0, "pixels": 0}
+
+    def invalidate(self):
+        self.force_full = True
+
+    def _static_bg(self):
+        if self.bg is None or self.bg.get_size() != self.screen.get_size():
+            self.bg = pygame.Surface(self.screen.get_size())
+            self.background.draw(self.bg, self.bounds.topleft)
+        return self.bg
+
+    def present(self, items, overlay=None, underlay=None):
+        """items zeichnen und anzeigen; overlay(screen) wird danach, underlay(screen) direkt auf den
+        Hintergrund gezeichnet (beide erzwingen einen Voll-Frame)."""
+        screen = self.screen
+        cur = {}
+        for surf, rect in items:
+            cur[(id(surf), surf.get_alpha(), rect.x, rect.y, rect.w, rect.h)] = (surf, rect)
+        full = (self.force_full or overlay is not None or underlay is not None
+                or not self.background.is_static())
+
+        if not full:
+            changed = [r for k, (_, r) in cur.items() if k not in self.last]
+            changed += [r for k, (_, r) in self.last.items() if k not in cur]
+            bounds = self.bounds
+            dirty = merge_rects([r.clip(bounds) for r in changed if r.colliderect(bounds)])
+            area = sum(r.w * r.h for r in dirty)
+            if area > self.full_ratio * bounds.w * bounds.h:
+                full = True
+            elif not dirty:
+                self.stats["idle"] += 1
+            else:
+                bg = self._static_bg()
+                rects = [r for _, r in items]
+                for d in dirty:
+                    screen.set_clip(d)
+                    screen.blit(bg, d, d)
+                    screen.blits([items[i] for i in d.collidelistall(rects)], doreturn=False)
+                screen.set_clip(None)
+                pygame.display.update(dirty)
+                self.stats["partial"] += 1
+                self.stats["pixels"] += area
+
+        if full:
+            screen.set_clip(self.bounds)
+            self.background.draw(screen, self.bounds.topleft)
+            if underlay is not None:
+                underlay(screen)
+            screen.blits(items)
+            screen.set_clip(None)
+            if overlay is not None:
+                overlay(screen)
+            pygame.display.flip()
+            self.force_full = False
+            self.stats["full"] += 1
+            self.stats["pixels"] += screen.get_width() * screen.get_height()
+        self.last = cur
+
+
+def save_run(world):
+    """Letzten Lauf (und ggf. neuen Bestwert) als Replay und Geisterbahn sichern – nur Desktop."""
+    if IS_WEB:
+        return
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), REPLAY_DIR)
+    replay = Replay.from_world(world)
+    track = GhostTrack.from_world(world)
+    try:
+        replay.save(os.path.join(base, "last.fakr"))
+        track.save(os.path.join(base, "last.fakg"))
+        best_path = os.path.join(base, "best.fakr")
+        best = Replay.load(best_path) if os.path.exists(best_path) else None
+        if not replay.flags and (best is None or replay.score > best.score):
+            replay.save(best_path)
+            track.save(os.path.join(base, "best.fakg"))
+    except (OSError, ValueError) as e:
+        dbg("Replay nicht gespeichert:", e)
+
+
+async def main(replay_path=None, daily=False, quality=None, low_latency=LOW_LATENCY, scale=None,
+               ghost_race=False, ghost_stress=0):
     pygame.init()
     pygame.display.set_caption(TITLE)
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    if scale is None:
+        scale = web_scale() if IS_WEB else RENDER_SCALE
+    screen = pygame.display.set_mode(window_size(scale), 0 if IS_WEB else pygame.RESIZABLE)
     screen.fill((0, 0, 0)); pygame.display.flip()
     clock = pygame.time.Clock()
-    font_big = pygame.font.SysFont("arial", 48, bold=True)
-    font = pygame.font.SysFont("arial", 24, bold=True)
+    font_big = get_font(48, bold=True)
+    font = get_font(24, bold=True)
 
     # --- Charakter-Auswahl ---
     # --- Charakter-Bilder prüfen (nicht hart beenden im Web) ---
-try:
-    missing = []
-    for c in CHARACTERS:
-        for k in ("skin", "avatar"):
-            p = os.path.join(os.path.dirname(__file__), c[k])
+    try:
+        missing = []
+        covered = atlas_sources()   # Web-Bundle: Quellbilder fehlen, der Atlas enthält sie fertig
+        for c in CHARACTERS:
+            for k in ("skin", "avatar"):
+                p = os.path.join(os.path.dirname(__file__), c[k])
+                if not os.path.exists(p) and c[k] not in covered:
+                    # Im Web/APK gibt es oft keinen OS-Pfad -> mit load_image_local prüfen
+                    try:
+                        _ = load_image_local(c[k])
+                    except Exception:
+                        missing.append(c[k])
+        if missing:
+            raise RuntimeError("Fehlende Bilddateien: " + ", ".join(missing))
+    except Exception as e:
+        screen.fill((20, 20, 20))
+        f1 = pygame.font.Font(None, 36)
+        f2 = pygame.font.Font(None, 22)
+        msg1 = f1.render("Asset-Fehler", True, (255, 80, 80))
+        msg2 = f2.render(str(e), True, (230, 230, 230))
+        msg3 = f2.render("Tip: Alle Bilder ins Projekt-Root legen.", True, (200, 200, 200))
+        cx, cy = screen.get_rect().center
+        screen.blit(msg1, msg1.get_rect(center=(cx, cy - 20)))
+        screen.blit(msg2, msg2.get_rect(center=(cx, cy + 10)))
+        screen.blit(msg3, msg3.get_rect(center=(cx, cy + 36)))
+        pygame.display.flip()
+        # Warten bis Taste/Maus, damit man es lesen kann
+        await wait_for_key(clock)
+        return
+        # Collectibles prüfen
+        for spec in COLLECTIBLES:
+            p = os.path.join(os.path.dirname(__file__), spec["file"])
             if not os.path.exists(p):
-                # Im Web/APK gibt es oft keinen OS-Pfad -> mit load_image_local prüfen
-                try:
-                    _ = load_image_local(c[k])
-                except Exception:
-                    missing.append(c[k])
-    if missing:
-        raise RuntimeError("Fehlende Bilddateien: " + ", ".join(missing))
-except Exception as e:
-    screen.fill((20, 20, 20))
-    f1 = pygame.font.Font(None, 36)
-    f2 = pygame.font.Font(None, 22)
-    msg1 = f1.render("Asset-Fehler", True, (255, 80, 80))
-    msg2 = f2.render(str(e), True, (230, 230, 230))
-    msg3 = f2.render("Tip: Alle Bilder ins Projekt-Root legen.", True, (200, 200, 200))
-    screen.blit(msg1, msg1.get_rect(center=(WIDTH//2, HEIGHT//2 - 20)))
-    screen.blit(msg2, msg2.get_rect(center=(WIDTH//2, HEIGHT//2 + 10)))
-    screen.blit(msg3, msg3.get_rect(center=(WIDTH//2, HEIGHT//2 + 36)))
-    pygame.display.flip()
-    # Warten bis Taste/Maus, damit man es lesen kann
-    waiting = True
-    while waiting:
-        for ev in pygame.event.get():
-            if ev.type in (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
-                waiting = False
-    return
-    # Collectibles prüfen
-    for spec in COLLECTIBLES:
-        p = os.path.join(os.path.dirname(__file__), spec["file"])
-        if not os.path.exists(p):
-            missing.append(p)
-    if missing:
-        print("Fehlende Bilddateien:\n- " + "\n- ".join(missing))
-        print("Bitte die Dateien in den gleichen Ordner wie das Skript legen.")
-        pygame.quit(); sys.exit(1)
-
-    selected_idx = character_select(screen, clock, font_big, font)
+                missing.append(p)
+        if missing:
+            print("Fehlende Bilddateien:\n- " + "\n- ".join(missing))
+            print("Bitte die Dateien in den gleichen Ordner wie das Skript legen.")
+            pygame.quit(); sys.exit(1)
+
+    # Bilder im Hintergrund laden; jede Szene wartet nur auf das, was sie braucht
+    assets = AssetLoader()
+    queue_startup_assets(assets)
+
+    profiler = FrameProfiler()
+    governor = QualityGovernor(forced=quality)   # quality: feste Stufe (--quality), sonst automatisch
+    overlay_font = get_font(18, name=None)
+    view = View(screen, scale)
+    selected_idx = await character_select(screen, clock, font_big, font, profiler, assets, governor, view)
     chosen = CHARACTERS[selected_idx]
-    face_surface = make_face_circle_from_file(chosen["avatar"], size=72)
-
-    # Gruppen
-    all_sprites = pygame.sprite.Group()
-    pipe_group = pygame.sprite.Group()
-    collect_group = pygame.sprite.Group()
+    await assets.wait([face_asset(chosen)] + ["wing:" + f for f in WING_FILES]
+                      + [collectible_asset(s) for s in COLLECTIBLES], view.screen, clock, font)
+    face_surface = assets.get(face_asset(chosen))
+
+    # Welt (Logik) + Anzeige-Sprites
+    world = World(face_surface, wings=tuple(assets.get("wing:" + f) for f in WING_FILES))
+    world.profiler = profiler
+    bird = world.bird
     popup_group = pygame.sprite.Group()
     ground = Ground()
-    all_sprites.add(ground)
-
-    bird = Bird(100, HEIGHT // 2, face_surface)
-    all_sprites.add(bird)
+    warm_collectible_cache(assets=assets)
+    pools = dict(world.pools, popup=SpritePool(ScorePopup))
+    # Alles bis hier lebt bis zum Ende → aus der GC-Generationensuche nehmen
+    gc.collect()
+    gc.freeze()
+
+    # Replay-Modus: Flaps kommen aus der Aufnahme, SPACE startet sie neu
+    player = ReplayPlayer(Replay.load(replay_path)) if replay_path else None
+
+    # Geister: gespeicherte Läufe (--ghost) und/oder Stresstest (--ghosts N) auf einem festen Kurs
+    ghosts = None
+    ghost_seed = None
+    if (ghost_race or ghost_stress) and not player:
+        tracks = []
+        if ghost_race and not IS_WEB:
+            ghost_seed, tracks = load_ghosts(daily_seed() if daily else None)
+        if ghost_seed is None:
+            ghost_seed = daily_seed() if daily else random.SystemRandom().getrandbits(32)
+        if ghost_stress:
+            tracks += stress_ghosts(ghost_seed, ghost_stress)
+        ghosts = GhostLayer(bird.frames, tracks)
+        dbg(f"Geister: {len(ghosts)} auf Kurs {ghost_seed}")
+
+    def start_run():
+        # Tageskurs: gleicher Seed für alle an diesem (UTC-)Tag; mit Geistern deren Kurs
+        world.reset(player.replay.seed if player else ghost_seed if ghosts else daily_seed() if daily else None)
+        release_all(popup_group)
 
     # Startzustand
     running = True
     playing = False
-    score = 0
-    last_pipe_x = WIDTH + 200
-    scored_pipes = set()
-    pipe_spawn_count = 0
-    force_collectible_key = None  # Debug: mit Taste "O" nächsten Spawn auf OTT erzwingen
+    debug_caption = False
+    stepper = FixedStep()
+    flap = False   # bleibt gesetzt, bis ein Sim-Schritt ihn verarbeitet hat
+    latency = InputLatency()
+    pacer = LowLatencyPacer() if low_latency and not IS_WEB else None
+    dirty = DirtyRenderer(view.screen, view.background, view.rect) if DIRTY_RENDERING else None
+    if player:
+        playing = True
+        start_run()
+        pygame.display.set_caption(f"{TITLE}  [Replay: {player.replay.score} Punkte]")
+    elif ghosts:
+        pygame.display.set_caption(f"{TITLE}  [{len(ghosts)} Geister]")
+    elif daily:
+        pygame.display.set_caption(f"{TITLE}  [Tageskurs {daily_seed()}]")
 
     while running:
-        dt = clock.tick(FPS) / 1000.0
+        dt = min(await next_frame(clock, pacer) / 1000.0, MAX_FRAME_DT)
+        frame_start = time.perf_counter()
+        profiler.begin_frame()
 
+        latency.polled(pacer.last_quiet if pacer else None)
         for event in pygame.event.get():
+            if handle_view_event(view, event):
+                governor.skip_frame()
+                if dirty:
+                    dirty = DirtyRenderer(view.screen, view.background, view.rect)
+                continue
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE and not player:
+                    latency.input()
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                handle_profiler_key(profiler, event.key)
+                handle_quality_key(governor, event.key)
+                if event.key == pygame.K_F8:
+                    dbg("Eingabe-Latenz:", latency.histogram_text())
+                if event.key == pygame.K_F9:
+                    low_latency = not low_latency
+                    pacer = LowLatencyPacer() if low_latency and not IS_WEB else None
+                    dbg("Low-Latency-Modus:", "an" if low_latency else "aus")
+                if event.key == pygame.K_F6:
+                    dirty = None if dirty else DirtyRenderer(view.screen, view.background, view.rect)
+                    dbg("Dirty-Rect-Rendering:", "an" if dirty else "aus")
                 if event.key == pygame.K_SPACE:
                     # neu starten, wenn nicht playing ODER wenn tot
                     if not playing or not bird.alive:
                         playing = True
-                        for p in pipe_group.sprites():
-                            p.kill()
-                        for c in collect_group.sprites():
-                            c.kill()
-                        for s in popup_group.sprites():
-                            s.kill()
-                        score = 0
-                        scored_pipes.clear()
-                        last_pipe_x = WIDTH + 120
-                        bird.rect.center = (100, HEIGHT // 2)
-                        bird.vel = 0
-                        bird.alive = True
-                    bird.flap()
+                        start_run()
+                    flap = True
                 if event.key == pygame.K_RETURN and not bird.alive:
                     # zurück zur Charakterauswahl
-                    selected_idx = character_select(screen, clock, font_big, font)
+                    selected_idx = await character_select(view.screen, clock, font_big, font, profiler, assets,
+                                                          governor, view)
                     chosen = CHARACTERS[selected_idx]
-                    face_surface = make_face_circle_from_file(chosen["avatar"], size=72)
-                    bird.base_image = face_surface
-                    bird.image = bird.base_image.copy()
+                    await assets.wait([face_asset(chosen)], view.screen, clock, font)
+                    face_surface = assets.get(face_asset(chosen))
+                    bird.set_face(face_surface)
+                    governor.skip_frame()   # Auswahl + Warten stecken in diesem Frame
+                    if ghosts:
+                        ghosts.set_frames(bird.frames)
+                    if dirty:
+                        # Auswahl hat den ganzen Schirm übermalt (und evtl. den Maßstab geändert)
+                        dirty = DirtyRenderer(view.screen, view.background, view.rect)
                     # Zurück zum Startscreen (noch nicht spielend)
                     playing = False
-                    for p in pipe_group.sprites():
-                        p.kill()
-                    for c in collect_group.sprites():
-                        c.kill()
-                    for s in popup_group.sprites():
-                        s.kill()
-                    score = 0
-                    scored_pipes.clear()
-                    last_pipe_x = WIDTH + 120
-                    bird.rect.center = (100, HEIGHT // 2)
-                    bird.vel = 0
-                    bird.alive = True
+                    start_run()
                 if event.key == pygame.K_r and not bird.alive:
                     playing = False  # zurück zum Startscreen (mit gewähltem Charakter behalten wir)
                 if event.key == pygame.K_o:
-                    force_collectible_key = "ott"
+                    world.force_collectible_key = "ott"
+                    debug_caption = True
                     pygame.display.set_caption(f"{TITLE}  [DEBUG: nächstes Collectible = OTT]")
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if not player:
+                    latency.input()
                 if not playing:
                     playing = True
-                    for p in pipe_group.sprites():
-                        p.kill()
-                    for c in collect_group.sprites():
-                        c.kill()
-                    for s in popup_group.sprites():
-                        s.kill()
-                    score = 0
-                    scored_pipes.clear()
-                    last_pipe_x = WIDTH + 120
-                    bird.rect.center = (100, HEIGHT // 2)
-                    bird.vel = 0
-                    bird.alive = True
-                bird.flap()
-
-        # Logik
-        if playing and bird.alive:
-            # Pipes spawnen (größerer Abstand = leichter)
-            if not pipe_group or (last_pipe_x - max([p.rect.x for p in pipe_group]) >= 320):
-                last_pipe_x = WIDTH + 120
-                top_p, bot_p, gap_center_y = spawn_pipe_pair(all_sprites, pipe_group, last_pipe_x)
-                pipe_spawn_count += 1
-                spawn_collectible = False
-                if pipe_spawn_count % COLLECTIBLE_EVERY == 0 and random.random() < COLLECTIBLE_PROB:
-                    spawn_collectible = True
-                if spawn_collectible:
-                    if force_collectible_key:
-                        # Spezifisches Item erzwingen (Debug)
-                        spec = next((c for c in COLLECTIBLES if c["key"] == force_collectible_key), None)
-                        force_collectible_key = None
-                        pygame.display.set_caption(TITLE)
-                        if spec is None:
-                            spec = weighted_choice(COLLECTIBLES)
-                    else:
-                        spec = weighted_choice(COLLECTIBLES)
-                    col = Collectible(spec, last_pipe_x + 30, gap_center_y)
-                    all_sprites.add(col)
-                    collect_group.add(col)
-
-            all_sprites.update(dt)
-
-            # Kollisionen
-            for p in pipe_group:
-                if bird.rect.colliderect(p.rect):
-                    bird.alive = False
-
-            # Kollision mit Collectibles (alle Typen)
-            for col in list(collect_group):
-                if bird.rect.colliderect(col.rect):
-                    score += col.points
-                    popup = ScorePopup(col.rect.centerx, col.rect.top - 10, f"+{col.points}", color=getattr(col, "pop_color", (255, 255, 255)))
-                    all_sprites.add(popup)
-                    popup_group.add(popup)
-                    col.kill()
-
-            # Boden
-            if bird.rect.bottom >= HEIGHT - 120:
-                bird.rect.bottom = HEIGHT - 120
-                bird.alive = False
-
-            # Score (wenn obere Pipe passiert)
-            for p in pipe_group:
-                if not getattr(p, "flipped", False):
-                    if p.rect.right < bird.rect.left and p not in scored_pipes:
-                        score += 1
-                        scored_pipes.add(p)
-
-        # Zeichnen
-        draw_background(screen)
-        for sprite in all_sprites:
-            if isinstance(sprite, Bird):
-                sprite.render(screen)
-            else:
-                screen.blit(sprite.image, sprite.rect)
+                    start_run()
+                flap = True
+        profiler.lap("events")
+
+        # Logik (feste Sim-Schritte, Anzeige interpoliert dazwischen)
+        if playing and bird.alive and not (player and player.done(world.frame)):
+            steps = stepper.advance(dt)
+            if low_latency and flap and not steps and not player:
+                steps = stepper.borrow()   # Flap nicht bis zum nächsten Frame liegen lassen
+            for _ in range(steps):
+                if player:
+                    if player.done(world.frame):
+                        break
+                    flap = player.flap_at(world.frame)
+                for kind, data in world.step(SIM_DT, flap):
+                    if kind == "pickup":
+                        x, y, points, color = data
+                        popup = pools["popup"].acquire(x, y - 10, f"+{points}", color=color)
+                        popup_group.add(popup)
+                    elif kind == "dead" and not player:
+                        save_run(world)
+                        if ghosts:
+                            ghosts.add(GhostTrack.from_world(world))   # gegen den eigenen letzten Versuch
+                if flap:
+                    latency.apply()
+                flap = False
+                if not bird.alive:
+                    break
+            ground.update(dt)
+            popup_group.update(dt)
+            view.background.update(dt)
+            profiler.lap("popups")
+            if debug_caption and world.force_collectible_key is None:
+                debug_caption = False
+                pygame.display.set_caption(TITLE)
+        else:
+            stepper.reset()
+            flap = False
+            latency.drop()
+        score = world.score
+        # Low-Latency: neuesten Sim-Zustand zeigen statt zwischen den letzten beiden zu interpolieren
+        # (spart bis zu einen Sim-Schritt Anzeige-Verzögerung, dafür etwas weniger glatt bei hoher Bildrate)
+        alpha = stepper.alpha if playing and bird.alive and not low_latency else 1.0
+
+        # Zeichnen (als Display-Liste, damit der Dirty-Rect-Modus Änderungen erkennen kann)
+        items = world_draw_list(world, ground, popup_group, alpha)
+        profiler.lap("sprites")
 
         # UI / Texte
         if not playing:
             # Haupttitel
-            title_surf = font_big.render("FlappyAkh", True, WHITE)
-            screen.blit(title_surf, title_surf.get_rect(center=(WIDTH//2, HEIGHT//2 - 60)))
+            title_surf = render_text(font_big, "FlappyAkh", WHITE)
+            items.append((title_surf, title_surf.get_rect(center=(WIDTH//2, HEIGHT//2 - 60))))
 
             # Charaktername direkt darunter
-            name_surf = font.render(f"{chosen['name']}", True, (255, 240, 0))
-            screen.blit(name_surf, name_surf.get_rect(center=(WIDTH//2, HEIGHT//2 - 20)))
+            name_surf = render_text(font, chosen["name"], (255, 240, 0))
+            items.append((name_surf, name_surf.get_rect(center=(WIDTH//2, HEIGHT//2 - 20))))
 
             # Hinweistext
-            hint = font.render("Drück SPACE oder klicke, um zu starten", True, BLACK)
-            screen.blit(hint, hint.get_rect(center=(WIDTH//2, HEIGHT//2 + 30)))
+            hint = render_text(font, "Drück SPACE oder klicke, um zu starten", BLACK)
+            items.append((hint, hint.get_rect(center=(WIDTH//2, HEIGHT//2 + 30))))
         else:
-            score_surf = font_big.render(str(score), True, WHITE)
-            screen.blit(score_surf, score_surf.get_rect(midtop=(WIDTH//2, 20)))
+            score_surf = render_text(font_big, str(score), WHITE)
+            items.append((score_surf, score_surf.get_rect(midtop=(WIDTH//2, 20))))
 
         if playing and not bird.alive:
-            over = font_big.render("Game Over", True, BLACK)
-            restart = font.render("Drück R für Neustart", True, BLACK)
-            screen.blit(over, over.get_rect(center=(WIDTH//2, HEIGHT//2 - 10)))
-            screen.blit(restart, restart.get_rect(center=(WIDTH//2, HEIGHT//2 + 40)))
-
-        pygame.display.flip()
-
+            over = render_text(font_big, "Game Over", BLACK)
+            restart = render_text(font, "Drück R für Neustart", BLACK)
+            items.append((over, over.get_rect(center=(WIDTH//2, HEIGHT//2 - 10))))
+            items.append((restart, restart.get_rect(center=(WIDTH//2, HEIGHT//2 + 40))))
+        profiler.lap("hud")
+
+        if dirty is not None:
+            overlay = (lambda s: profiler.draw_overlay(s, overlay_font)) if profiler.enabled else None
+            underlay = (lambda s: ghosts.draw(s, view, world.frame, alpha)) if ghosts else None
+            dirty.present(view.items(items), overlay, underlay)
+            latency.presented()
+            profiler.lap("flip")
+        else:
+            screen = view.screen
+            screen.set_clip(view.rect)
+            view.background.draw(screen, view.rect.topleft)
+            profiler.lap("background")
+            if ghosts:
+                ghosts.draw(screen, view, world.frame, alpha)
+                profiler.lap("ghosts")
+            screen.blits(view.items(items))
+            screen.set_clip(None)
+            profiler.lap("sprites")
+            profiler.draw_overlay(screen, overlay_font)
+            profiler.lap("overlay")
+            pygame.display.flip()
+            latency.presented()
+            profiler.lap("flip")
+        profiler.end_frame(pipes=len(world.pipes), items=len(world.collectibles), popups=len(popup_group),
+                           ghosts=ghosts.drawn if ghosts else 0, quality=governor.name,
+                           input=f"{latency.last_ms:.1f}ms")
+        governor.frame((time.perf_counter() - frame_start) * 1000.0)
+
+    dbg("Pools:", pool_report(pools))
+    dbg("Text-Cache:", text_cache_report())
+    dbg("Qualität:", governor.report())
+    dbg("Eingabe-Latenz:", latency.histogram_text())
+    assets.close()
+    if dirty:
+        dbg("Dirty-Rects:", dirty.stats)
     pygame.quit()
 
 
-if __name__ == "__main__":
+async def run(args):
+    """Einstieg für Desktop und Web: Spiel starten, bei Fehlern Fehlerbildschirm statt schwarzem Fenster."""
     try:
-        main()
+        # python main.py --replay replays/best.fakr  → Lauf in Echtzeit ansehen
+        # python main.py --daily                     → Tageskurs (gleiche Säulen für alle)
+        # python main.py --quality niedrig           → feste Qualitätsstufe (hoch/mittel/niedrig/minimal oder 0–3)
+        # python main.py --low-latency               → Eingaben sofort abholen, Flaps im selben Frame zeigen
+        # python main.py --scale 2                   → doppelt so großes Fenster, alle Bilder neu gebacken
+        # python main.py --ghost                     → gegen gespeicherte Läufe (Geister) auf deren Kurs fliegen
+        # python main.py --ghosts 500                → Stresstest mit 500 Geistern
+        await main(args[args.index("--replay") + 1] if "--replay" in args[:-1] else None, daily="--daily" in args,
+                   quality=args[args.index("--quality") + 1] if "--quality" in args[:-1] else None,
+                   low_latency=LOW_LATENCY or "--low-latency" in args,
+                   scale=float(args[args.index("--scale") + 1]) if "--scale" in args[:-1] else None,
+                   ghost_race="--ghost" in args,
+                   ghost_stress=int(args[args.index("--ghosts") + 1]) if "--ghosts" in args[:-1] else 0)
     except SystemExit:
         raise
     except Exception as e:
@@ -753,11 +3192,12 @@ if __name__ == "__main__":
                     txt = f1.render(line, True, (255, 200, 200)) if y == 40 else f2.render(line, True, (230,230,230))
                     surf.blit(txt, (24, y)); y += 28
                 pygame.display.flip()
-                waiting = True
-                while waiting:
-                    for ev in pygame.event.get():
-                        if ev.type in (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
-                            waiting = False
+                await wait_for_key()
         except Exception:
             pass
         raise
+
+
+if __name__ == "__main__":
+    # pygbag führt asyncio.run im Browser über die eigene Event-Loop aus → gleicher Weg wie am Desktop
+    asyncio.run(run(sys.argv[1:]))
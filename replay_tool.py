@@ -0,0 +1,63 @@
+# replay_tool.py – FlappyAkh-Replays ohne Fenster prüfen und vorspulen
+# Aufruf:  python replay_tool.py info   replays/best.fakr
+#          python replay_tool.py verify replays/*.fakr     → Exit-Code 1 bei Abweichung
+#          python replay_tool.py ff     replays/last.fakr  → so schnell wie möglich abspielen
+#          python replay_tool.py ghost  replays/top.fakr   → Geisterbahn daneben schreiben (top.fakg, für --ghost)
+# Echtzeit-Wiedergabe mit Fenster:  python main.py --replay replays/best.fakr
+
+import os
+import sys
+import time
+
+import main as game
+
+
+def info(path):
+    r = game.Replay.load(path)
+    secs = r.ticks / r.sim_hz
+    flags = " (Debug)" if r.flags & game.Replay.FLAG_DEBUG else ""
+    print(f"{path}: Seed {r.seed}, {r.score} Punkte, {r.ticks} Schritte ({secs:.1f}s), "
+          f"{len(r.flap_ticks)} Flaps, {len(r.to_bytes())} Bytes{flags}")
+    return True
+
+
+def verify(path):
+    r = game.Replay.load(path)
+    ok = game.verify_replay(r)
+    if ok:
+        status = "ok"
+    else:
+        world = game.play_replay(r)   # nur für die Meldung nochmal
+        status = f"ABWEICHUNG: {world.score} Punkte nach {world.frame} Schritten"
+    print(f"{path}: erwartet {r.score} Punkte / {r.ticks} Schritte → {status}")
+    return ok
+
+
+def fast_forward(path):
+    r = game.Replay.load(path)
+    t = time.perf_counter()
+    world = game.play_replay(r)
+    dt = time.perf_counter() - t
+    speed = (world.frame / r.sim_hz) / dt if dt > 0 else float("inf")
+    print(f"{path}: {world.score} Punkte, {world.frame} Schritte in {dt * 1000:.0f} ms "
+          f"({speed:.0f}x Echtzeit)")
+    return True
+
+
+def ghost(path):
+    r = game.Replay.load(path)
+    track = game.GhostTrack.from_replay(r)
+    out = os.path.splitext(path)[0] + ".fakg"
+    track.save(out)
+    print(f"{path}: {len(track)} Schritte → {out} ({os.path.getsize(out)} Bytes)")
+    return True
+
+
+COMMANDS = {"info": info, "verify": verify, "ff": fast_forward, "ghost": ghost}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in COMMANDS:
+        sys.exit("Aufruf: python replay_tool.py {info|verify|ff|ghost} DATEI...")
+    cmd = COMMANDS[sys.argv[1]]
+    results = [cmd(p) for p in sys.argv[2:]]
+    sys.exit(0 if all(results) else 1)